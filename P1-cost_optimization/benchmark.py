@@ -0,0 +1,165 @@
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time as timer
+import tracemalloc
+from typing import Any, Dict, List, Tuple, Union
+
+from main import BACKENDS, _numpy, box_sizes, city_costs, minimize_cost
+
+
+def make_regions(count: int, seed: int = 0) -> Dict[str, Dict[str, Union[float, None]]]:
+    """
+    Build `count` synthetic regions by perturbing the built-in city prices by up to ±20%.
+    """
+    rng = random.Random(seed)
+    templates = list(city_costs.values())
+    regions = {}
+    for k in range(count):
+        template = templates[k % len(templates)]
+        regions[f"region-{k}"] = {
+            box: None if cost is None else round(cost * rng.uniform(0.8, 1.2), 1)
+            for box, cost in template.items()
+        }
+    return regions
+
+
+def measure(backend: str, capacity: int, regions: Dict[str, Dict[str, Union[float, None]]],
+            time: int, repeat: int = 3) -> Dict[str, Any]:
+    """
+    Time `minimize_cost` (best of `repeat` runs) and measure its peak traced memory.
+
+    Memory is measured in a separate run because tracemalloc slows the solver down.
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = timer.perf_counter()
+        minimize_cost(time, capacity, box_sizes, regions, backend=backend)
+        seconds = min(seconds, timer.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        minimize_cost(time, capacity, box_sizes, regions, backend=backend)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "backend": backend,
+        "capacity": capacity,
+        "regions": len(regions),
+        "time": time,
+        "seconds": seconds,
+        "regions_per_second": len(regions) / seconds if seconds else None,
+        "capacity_per_second": capacity * len(regions) / seconds if seconds else None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def run(capacities: List[int], region_counts: List[int], times: List[int], backends: List[str],
+        budget: float = 30.0, repeat: int = 3) -> List[Dict[str, Any]]:
+    """
+    Benchmark every combination, in increasing capacity order.
+
+    Once a (backend, regions, time) series takes longer than `budget` seconds at some
+    capacity, its larger capacities are recorded as skipped instead of run.
+    """
+    results = []
+    for backend in backends:
+        for count in region_counts:
+            regions = make_regions(count)
+            for time in times:
+                over_budget = False
+                for capacity in sorted(capacities):
+                    if over_budget:
+                        results.append({"backend": backend, "capacity": capacity,
+                                        "regions": count, "time": time, "skipped": True})
+                        continue
+                    # Large tables are only measured once.
+                    result = measure(backend, capacity, regions, time,
+                                     repeat if capacity <= 10**5 else 1)
+                    results.append(result)
+                    print(f"{backend:>6} regions={count:<5} time={time:<4} capacity={capacity:<10} "
+                          f"{result['seconds']:.4f}s peak={result['peak_memory_bytes'] / 2**20:.1f}MiB",
+                          file=sys.stderr)
+                    over_budget = result["seconds"] > budget
+    return results
+
+
+def compare(baseline: List[Dict[str, Any]], current: List[Dict[str, Any]],
+            threshold: float = 0.2) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Pair up matching measurements and return those at least `threshold` slower than the baseline.
+    """
+    def key(result: Dict[str, Any]) -> Tuple:
+        return result["backend"], result["capacity"], result["regions"], result["time"]
+
+    previous = {key(result): result for result in baseline if not result.get("skipped")}
+    regressions = []
+    for result in current:
+        before = previous.get(key(result))
+        if before is None or result.get("skipped"):
+            continue
+        if result["seconds"] > before["seconds"] * (1 + threshold):
+            regressions.append((before, result))
+    return regressions
+
+
+def _version() -> str:
+    """
+    The git revision of the working tree, or "unknown" outside a git checkout.
+    """
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _int_list(text: str) -> List[int]:
+    return [int(float(value)) for value in text.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark minimize_cost and track regressions.")
+    parser.add_argument("--capacities", type=_int_list, default=_int_list("1e3,1e4,1e5,1e6,1e7,1e8"),
+                        help="Comma-separated capacities (default: 1e3 to 1e8).")
+    parser.add_argument("--regions", type=_int_list, default=[3, 50],
+                        help="Comma-separated region counts (default: 3,50).")
+    parser.add_argument("--times", type=_int_list, default=[1, 24],
+                        help="Comma-separated time multipliers (default: 1,24).")
+    parser.add_argument("--backends", default=",".join(b for b in BACKENDS if b != "numpy" or _numpy()),
+                        help="Comma-separated backends (default: every installed backend).")
+    parser.add_argument("--budget", type=float, default=30.0,
+                        help="Skip larger capacities once a run exceeds this many seconds.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept).")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="Report measurements slower than this earlier results file.")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative slowdown reported as a regression (default: 0.2).")
+    args = parser.parse_args()
+
+    report = {
+        "version": _version(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": run(args.capacities, args.regions, args.times, args.backends.split(","),
+                       args.budget, args.repeat),
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline["results"], report["results"], args.threshold)
+        for before, after in regressions:
+            print(f"REGRESSION {after['backend']} capacity={after['capacity']} regions={after['regions']} "
+                  f"time={after['time']}: {before['seconds']:.4f}s -> {after['seconds']:.4f}s "
+                  f"({baseline['version']} -> {report['version']})")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,147 @@
+"""
+Quoting daemon for shell pipelines that call the optimizer thousands of times.
+
+    python daemon.py [--socket PATH] [--warm CAPACITY] [--prices FILE] [--workers N]
+                     [--timeout SECONDS] [--max-capacity CAPACITY]
+
+Keeps the DP tables of one price book warm in a long-running process and answers the
+`--stream` JSONL protocol of main.py on a Unix socket; `quote.py` is its client.
+"""
+
+import argparse
+import io
+import os
+import signal
+import socketserver
+import stat
+import sys
+import threading
+from typing import Dict, List, Tuple, Union
+
+import pricebook
+from main import box_sizes, city_costs, minimize_cost_batch, stream_quotes
+from quote import default_socket
+from table_cache import TableCache
+
+
+# Seconds a connection may stay idle before the daemon closes it.
+IDLE_TIMEOUT = 30.0
+
+# Largest capacity quoted by default. Solves take turns on the shared cache, so an
+# unbounded capacity would let one request hold every other client up while its table grows.
+DEFAULT_MAX_CAPACITY = 1_000_000
+
+
+def _claim(path: str) -> None:
+    """
+    Make `path` ready to bind: create its directory (private to the current user) if
+    needed, refuse a directory another user controls, and remove a stale socket.
+
+    Raises:
+        PermissionError: If the directory belongs to another user and is not sticky
+                         (/tmp itself is sticky, so other users cannot replace the socket).
+        FileExistsError: If `path` exists and is not a socket.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.stat(directory)
+    if info.st_uid != os.getuid() and not info.st_mode & stat.S_ISVTX:
+        raise PermissionError(f"{directory} is not owned by the current user.")
+
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket.")
+    os.unlink(path)
+
+
+def serve(path: str,
+          box_sizes: List[Tuple[str, int]],
+          city_costs: Dict[str, Dict[str, Union[float, None]]],
+          warm: int = 0,
+          workers: int = 1,
+          timeout: float = IDLE_TIMEOUT,
+          max_capacity: int = DEFAULT_MAX_CAPACITY
+         ) -> None:
+    """
+    Answer quotes on a Unix socket from a long-running process with warm tables.
+
+    Each connection speaks the `--stream` protocol: JSONL requests in, one JSON result
+    line out per request, answered as soon as its line arrives. Every connection shares
+    one `TableCache`, so after the first request for a capacity (or right away, up to
+    `warm`) a quote is a lookup and a backtrack, and a client pays only for connecting.
+    Connections are served on their own threads, so a client holding its connection
+    open does not hold up the others; solves take turns on the shared cache, each a
+    few microseconds once warm. A connection idle for `timeout` seconds is closed, and
+    a request for more than `max_capacity` is answered with an {"error": ...} line.
+
+    Parameters:
+        path (str): Path of the Unix socket; a stale socket there is replaced.
+        box_sizes (list of tuples): A list where each tuple consists of (box_name, box_volume).
+        city_costs (dict): A dictionary mapping each city name to another dictionary,
+                           which in turn maps a box type to its cost per hour.
+        warm (int): Build every city's table up to this capacity before accepting clients.
+        workers (int): See `minimize_cost`.
+        timeout (float): Seconds a connection may wait between requests.
+        max_capacity (int): Largest capacity a request may ask for.
+    """
+    cache = TableCache(max_tables=max(128, len(city_costs)))
+    lock = threading.Lock()
+    if warm:
+        minimize_cost_batch([(1, warm)], box_sizes, city_costs, cache=cache, workers=workers)
+
+    class QuoteHandler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            self.connection.settimeout(timeout)
+            lines = io.TextIOWrapper(self.rfile, encoding="utf-8")
+            try:
+                for line in lines:
+                    answer = io.StringIO()
+                    # TableCache is not thread-safe; the lock is released before writing,
+                    # so a client slow to read its answer does not hold up the others.
+                    with lock:
+                        stream_quotes([line], answer, box_sizes, city_costs, chunk_size=1,
+                                      cache=cache, workers=workers, max_capacity=max_capacity)
+                    self.wfile.write(answer.getvalue().encode())
+            except OSError:
+                pass  # The client left, or stayed idle past the timeout.
+
+    class QuoteServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    _claim(path)
+    with QuoteServer(path, QuoteHandler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            if stat.S_ISSOCK(os.lstat(path).st_mode):
+                os.unlink(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Unix socket quoting daemon for minimize_cost.")
+    parser.add_argument("--socket", default=default_socket(),
+                        help=f"Socket to listen on (default: {default_socket()}).")
+    parser.add_argument("--warm", type=int, default=0, metavar="CAPACITY",
+                        help="Build the tables up to CAPACITY before serving.")
+    parser.add_argument("--prices", metavar="FILE", help="Price book (.json, .csv or .pbk).")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes building tables (default: 1).")
+    parser.add_argument("--timeout", type=float, default=IDLE_TIMEOUT,
+                        help=f"Seconds an idle connection is kept open (default: {IDLE_TIMEOUT:g}).")
+    parser.add_argument("--max-capacity", type=int, default=DEFAULT_MAX_CAPACITY,
+                        help=f"Largest capacity quoted (default: {DEFAULT_MAX_CAPACITY}).")
+    args = parser.parse_args()
+
+    if args.prices is not None:
+        box_sizes, city_costs = pricebook.load(args.prices)
+
+    # SIGTERM exits through `serve`'s cleanup, so the socket file is removed.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        serve(args.socket, box_sizes, city_costs, args.warm, args.workers, args.timeout,
+              args.max_capacity)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,143 @@
+import argparse
+import random
+import sys
+import time as timer
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from main import _numpy, _to_minor, minimize_cost, minimize_cost_batch
+from repricing import IncrementalPricer
+
+
+# A generated request: (box_sizes, city_costs, time, capacity).
+Case = Tuple[List[Tuple[str, int]], Dict[str, Dict[str, Union[float, None]]], int, int]
+
+
+def _repriced(time: int, capacity: int, box_sizes, city_costs) -> Dict[str, Any]:
+    """
+    Quote through an `IncrementalPricer` whose prices reached `city_costs` by updates.
+    """
+    start = {region: {box: 1 for box in costs} for region, costs in city_costs.items()}
+    pricer = IncrementalPricer(box_sizes, start, capacity)
+    pricer.update(city_costs)
+    return pricer.quote(time, capacity)
+
+
+# Every way of solving an exact-fill request, by name. The first is the reference.
+VARIANTS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "python": lambda t, c, b, p: minimize_cost(t, c, b, p),
+    "python-periodic": lambda t, c, b, p: minimize_cost(t, c, b, p, periodic=True),
+    "python-no-picks": lambda t, c, b, p: minimize_cost(t, c, b, p, store_picks=False),
+    "python-low-memory": lambda t, c, b, p: minimize_cost(t, c, b, p, low_memory=True),
+    "batch": lambda t, c, b, p: minimize_cost_batch([(t, c)], b, p)[0],
+    "repricing": _repriced,
+}
+if _numpy() is not None:
+    VARIANTS["numpy"] = lambda t, c, b, p: minimize_cost(t, c, b, p, backend="numpy")
+    VARIANTS["numpy-periodic"] = lambda t, c, b, p: minimize_cost(t, c, b, p, backend="numpy",
+                                                                   periodic=True)
+
+
+def random_case(rng: random.Random, max_capacity: int = 3000) -> Case:
+    """
+    Generate a random catalog, prices (some boxes not offered, some finer than a paisa),
+    time and capacity.
+
+    Volumes often share a common factor, so GCD scaling is exercised, and capacities
+    range up to `max_capacity`, past the periodic threshold of small catalogs.
+    """
+    factor = rng.choice([1, 1, 2, 5, 10])
+    volumes = sorted(rng.sample(range(1, 60), rng.randint(1, 6)), reverse=True)
+    box_sizes = [(f"B{volume * factor}", volume * factor) for volume in volumes]
+
+    city_costs = {}
+    for k in range(rng.randint(1, 4)):
+        city_costs[f"city-{k}"] = {
+            name: None if rng.random() < 0.25 else rng.choice([rng.randint(1, 400),
+                                                                round(rng.uniform(0.5, 400), 1),
+                                                                round(rng.uniform(0.001, 5), 3)])
+            for name, _ in box_sizes
+        }
+    time = rng.choice([0, 1, 1, 2, 3, 24, rng.randint(1, 100)])
+    capacity = rng.choice([0, rng.randint(1, 100), rng.randint(1, max_capacity)])
+    return box_sizes, city_costs, time, capacity
+
+
+def check(case: Case, result: Dict[str, Any], reference: Dict[str, Any]) -> None:
+    """
+    Assert that `result` has exactly the reference's costs and that every breakdown is a valid
+    fill: offered boxes only, exactly the capacity, and priced at the reported cost (each
+    hourly rate rounded to minor units, then multiplied by the time).
+    """
+    box_sizes, city_costs, time, capacity = case
+    volumes = dict(box_sizes)
+    assert [entry["region"] for entry in result["Output"]] == list(city_costs), "regions differ"
+
+    for entry, expected in zip(result["Output"], reference["Output"]):
+        region, total_cost, boxes = entry["region"], entry["total_cost"], entry["boxes"]
+        if expected["total_cost"] == "No solution" or total_cost == "No solution":
+            assert total_cost == expected["total_cost"], f"{region}: {total_cost} != {expected['total_cost']}"
+            assert boxes == {}, f"{region}: boxes without a solution"
+            continue
+        # Costs are solved in integer minor units, so every variant must match exactly.
+        assert total_cost == expected["total_cost"], f"{region}: cost {total_cost} != {expected['total_cost']}"
+        assert all(city_costs[region].get(box) is not None and count > 0 for box, count in boxes.items()), \
+            f"{region}: uses a box that is not offered"
+        assert sum(volumes[box] * count for box, count in boxes.items()) == capacity, \
+            f"{region}: boxes do not fill the capacity"
+        priced = sum(_to_minor(city_costs[region][box]) * time * count for box, count in boxes.items())
+        assert priced == _to_minor(total_cost), f"{region}: boxes cost {priced}, reported {total_cost}"
+
+
+def run(cases: int = 200, seed: int = 0, max_capacity: int = 3000,
+        variants: Union[List[str], None] = None) -> Dict[str, float]:
+    """
+    Solve `cases` random requests with every variant and check them against the reference.
+
+    Raises:
+        AssertionError: On the first disagreement, naming the variant and the case (with
+                        the seed, so it can be reproduced).
+
+    Returns:
+        dict: Total seconds spent by each variant on the same inputs.
+    """
+    names = variants or list(VARIANTS)
+    seconds = {name: 0.0 for name in names}
+    rng = random.Random(seed)
+    for number in range(cases):
+        case = random_case(rng, max_capacity)
+        results = {}
+        for name in names:
+            start = timer.perf_counter()
+            results[name] = VARIANTS[name](*case[2:], *case[:2])
+            seconds[name] += timer.perf_counter() - start
+
+        reference = results[names[0]]
+        check(case, reference, reference)
+        for name in names[1:]:
+            try:
+                check(case, results[name], reference)
+            except AssertionError as error:
+                raise AssertionError(f"{name} disagrees with {names[0]} on case {number} "
+                                     f"(seed {seed}): {error}\n{case}") from None
+    return seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Differential test of every solver variant.")
+    parser.add_argument("--cases", type=int, default=500, help="Number of random requests.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-capacity", type=int, default=3000)
+    parser.add_argument("--variants", default=",".join(VARIANTS),
+                        help="Comma-separated variants; the first is the reference.")
+    args = parser.parse_args()
+
+    try:
+        seconds = run(args.cases, args.seed, args.max_capacity, args.variants.split(","))
+    except AssertionError as error:
+        print(f"FAIL {error}", file=sys.stderr)
+        sys.exit(1)
+
+    reference = next(iter(seconds.values()))
+    print(f"{args.cases} cases agree. Time per variant on the same inputs:")
+    for name, total in seconds.items():
+        print(f"  {name:<18} {total:8.3f}s  ({reference / total if total else float('inf'):.2f}x)")
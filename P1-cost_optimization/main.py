@@ -1,6 +1,16 @@
+import argparse
 import json
 import sys
-from typing import List, Tuple, Dict, Any, Union
+import time as timer
+import tracemalloc
+from array import array
+from functools import reduce
+from itertools import islice
+from math import gcd, isqrt
+from typing import List, Tuple, Dict, Any, Callable, Iterable, Sequence, TextIO, Union
+
+import pricebook
+from table_cache import TableCache
 
 
 ################################
@@ -14,14 +24,1167 @@ city_costs = {
     "Kolkata": {"XS": 11, "S": 20, "M": None, "L": 67, "XL": 118, "XXL": None},
 }
 
+# Engines available for filling the DP table.
+BACKENDS = ("python", "numpy")
+
+# Upper bound on table cells (cities x capacities) relaxed together by the shared NumPy pass.
+_SHARED_PASS_CELLS = 1 << 18
+
+# Costs are solved in integer minor units (paise): a rate of 77.4 becomes 7740.
+MINOR_UNITS = 100
+
+# Cost of an unreachable capacity. Far above any real cost, with enough headroom that
+# adding a box cost to it never overflows a signed 64-bit integer.
+_UNREACHABLE = 1 << 62
+
 ################################
 
 
+# A city's boxes after filtering: (available_boxes, available_volumes, available_costs),
+# with costs in integer minor units.
+City = Tuple[List[str], List[int], List[int]]
+
+# A repeating rate schedule: (hours, cost per hour of each box) windows, in time order.
+Schedule = List[Tuple[int, Dict[str, Union[float, None]]]]
+
+# A solved request for one city: (minimum cost or None, list of (box index, count) pairs).
+Solution = Tuple[Union[int, None], List[Tuple[int, int]]]
+
+
+def _to_minor(cost: float) -> int:
+    """
+    A cost in integer minor units, rounded to the nearest one.
+    """
+    return round(cost * MINOR_UNITS)
+
+
+def _from_minor(cost: int) -> Union[int, float]:
+    """
+    A cost in minor units back in currency units: an int when it is whole, else a float.
+    """
+    units, rest = divmod(int(cost), MINOR_UNITS)
+    return units if rest == 0 else int(cost) / MINOR_UNITS
+
+
+def _filter_cities(box_sizes: List[Tuple[str, int]],
+                   city_costs: Dict[str, Dict[str, Union[float, None]]],
+                   time: int
+                  ) -> List[City]:
+    """
+    Keep, for each city, the boxes that have a valid cost and their total cost for `time` hours.
+
+    Costs are converted to integer minor units here, once, so every DP adds and compares
+    machine integers: results are exact and identical across backends. The hourly rate
+    is rounded to the nearest minor unit and then multiplied by `time`, so a quote costs
+    the same as the batch paths, which multiply the rounded rate by `time` afterwards.
+    """
+    cities = []
+    for cost_table in city_costs.values():
+        # Prepare lists for boxes that have valid costs in this city.
+        available_boxes = []
+        available_volumes = []
+        available_costs = []
+
+        # Filter box_sizes based on availability in the current city's cost table.
+        for box, size in box_sizes:
+            # Check if the cost exists and is not None
+            if box in cost_table and cost_table[box] is not None:
+                available_boxes.append(box)
+                available_volumes.append(size)
+                # Multiply the cost per hour by the total time to get the total cost for that box.
+                available_costs.append(_to_minor(cost_table[box]) * time)
+
+        cities.append((available_boxes, available_volumes, available_costs))
+    return cities
+
+
+def _numpy() -> Any:
+    """
+    The NumPy module, imported on first use, or None when it is not installed.
+
+    NumPy is optional and only the numpy code paths need it, so it is not imported at
+    module load: importing it would triple the startup time of a pure-Python quote.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _pick_array(boxes: int, size: int) -> "array":
+    """
+    A compact array of `size` box indices, all -1: one byte per entry (two for catalogs
+    of 128 boxes or more) instead of a pointer to a Python int.
+    """
+    return array("b" if boxes < 128 else "h", [-1]) * size
+
+
+def _window_hours(lengths: List[int], start: int, time: int) -> List[int]:
+    """
+    Hours spent in each window of a repeating schedule by `time` hours starting at `start`.
+
+    Whole cycles are counted at once, so the work depends on the number of windows and
+    not on how many cycles (e.g. days) the quote spans.
+    """
+    cycle = sum(lengths)
+    full, rest = divmod(time, cycle)
+    hours = [full * length for length in lengths]
+
+    # The remaining hours form one interval, which may wrap past the end of the cycle.
+    begin = start % cycle
+    segments = [(begin, min(begin + rest, cycle)), (0, max(begin + rest - cycle, 0))]
+    window_start = 0
+    for w, length in enumerate(lengths):
+        window_end = window_start + length
+        for low, high in segments:
+            hours[w] += max(0, min(high, window_end) - max(low, window_start))
+        window_start = window_end
+    return hours
+
+
+def _schedule_costs(city_costs: Dict[str, Dict[str, Union[float, None]]],
+                    schedule: Dict[str, Schedule],
+                    time: int,
+                    start: int = 0
+                   ) -> Dict[str, Dict[str, Union[float, None]]]:
+    """
+    Total cost of each box over the quote, for every city, under its rate schedule.
+
+    The same boxes are held for the whole quote, so a box's total cost is the sum over
+    the windows of its rate times the hours spent in that window, and the cheapest fill
+    is one DP on those totals. A box missing from a window the quote touches cannot be
+    held through it and is treated as unavailable. Cities without a schedule keep their
+    flat rate, multiplied by `time`. Each rate is rounded to minor units before it is
+    multiplied, as in `_filter_cities`, and the exact totals are returned in currency units.
+    """
+    unknown = set(schedule) - set(city_costs)
+    if unknown:
+        raise ValueError(f"Rate schedule for unknown regions: {sorted(unknown)}.")
+
+    totals = {}
+    for region, cost_table in city_costs.items():
+        windows = schedule.get(region)
+        if windows is None:
+            totals[region] = {box: None if cost is None else _from_minor(_to_minor(cost) * time)
+                              for box, cost in cost_table.items()}
+            continue
+        if not windows or any(length <= 0 for length, _ in windows):
+            raise ValueError(f"The rate schedule of {region} must have windows of positive hours.")
+
+        hours = _window_hours([length for length, _ in windows], start, time)
+        used = [(spent, rates) for spent, (_, rates) in zip(hours, windows) if spent]
+        totals[region] = {}
+        for box in set().union(*(rates for _, rates in windows)):
+            if any(rates.get(box) is None for _, rates in used):
+                totals[region][box] = None
+            else:
+                totals[region][box] = _from_minor(sum(spent * _to_minor(rates[box])
+                                                      for spent, rates in used))
+    return totals
+
+
+def _build_python(volumes: List[int],
+                  costs: List[int],
+                  capacity: int,
+                  store_picks: bool = True
+                 ) -> Tuple[List[int], Union["array", None]]:
+    """
+    Pure-Python exact-fill DP table over capacities 0..capacity.
+
+    Entries only depend on smaller capacities, so the table answers every capacity up
+    to `capacity` with `_backtrack`.
+
+    Returns:
+        tuple: (dp, choice) where dp[j] is the minimum cost to reach exactly j
+               (`_UNREACHABLE` if it cannot be) and choice[j] is the index of the last
+               box added to reach it (-1 if none),
+               or None when `store_picks` is off and `_backtrack` recovers the boxes
+               from dp alone.
+    """
+    n = len(volumes)
+    unreachable = _UNREACHABLE  # Local name: read once per capacity in the loop below.
+    # dp[j] will store the minimum cost to exactly achieve capacity j.
+    dp = [unreachable] * (capacity + 1)
+    dp[0] = 0  # Base case: zero cost to achieve zero capacity.
+
+    # choice[j] records the index of the box added to reach capacity j. The previous
+    # capacity is always j minus that box's volume, so it does not need to be stored.
+    choice = _pick_array(n, capacity + 1) if store_picks else None
+
+    # For each intermediate capacity j, try adding each box.
+    for j in range(capacity + 1):
+        if dp[j] != unreachable:
+            for i in range(n):
+                new_volume = j + volumes[i]
+                if new_volume <= capacity:
+                    new_cost = dp[j] + costs[i]
+                    if new_cost < dp[new_volume]:
+                        dp[new_volume] = new_cost
+                        if choice is not None:
+                            choice[new_volume] = i  # Store the index of the box.
+
+    return dp, choice
+
+
+def _build_python_packed(volumes: List[int],
+                         costs: List[int],
+                         capacity: int,
+                         store_picks: bool = True
+                        ) -> Tuple["array", Union["array", None]]:
+    """
+    `_build_python` for worker processes: the table is returned as typed arrays, which
+    pickle as raw buffers instead of one object per capacity.
+    """
+    dp, choice = _build_python(volumes, costs, capacity, store_picks)
+    return array("q", dp), choice
+
+
+def _build_numpy(volumes: List[int],
+                 cost_matrix: "np.ndarray",
+                 capacity: int
+                ) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    NumPy exact-fill DP table for several cities in one shared pass.
+
+    The table is a `(cities, capacity + 1)` matrix relaxed one box at a time. For a box
+    of volume `v` and cost `c`, capacities congruent modulo `v` form the columns of a
+    `(rows, v)` view of each city's row, and using that box any number of times on a
+    column is a running minimum of `dp[m] - m * c` shifted back by `k * c`. Each box is
+    therefore a handful of vectorized passes over every city at once instead of a
+    Python loop per capacity and per city. `choice` keeps only the index of the last
+    box added, as int8 (or int16 for large catalogs).
+
+    Parameters:
+        volumes (list of int): Volume of every box in the shared catalog.
+        cost_matrix (np.ndarray): `(cities, boxes)` int64 costs, `_UNREACHABLE` where a
+                                  city lacks a box.
+        capacity (int): Largest capacity the table has to answer.
+
+    Returns:
+        tuple: (dp, choice) matrices of width `capacity + 1`, read row by row with
+               `_backtrack`.
+    """
+    np = _numpy()
+    cities = len(cost_matrix)
+    width = capacity + 1
+    # Pad the rows by the largest volume so every box's residue view fits without copying.
+    padded = width + max(volumes) - 1
+    dp = np.full((cities, padded), _UNREACHABLE, dtype=np.int64)
+    dp[:, 0] = 0
+    choice = np.full((cities, padded), -1, dtype=np.int8 if len(volumes) < 128 else np.int16)
+
+    for i, volume in enumerate(volumes):
+        # Only the cities that offer this box take part in its pass.
+        offered = cost_matrix[:, i] < _UNREACHABLE
+        if not offered.any():
+            continue
+        every_city = bool(offered.all())
+        costs = cost_matrix[:, i] if every_city else cost_matrix[offered, i]
+        rows = (width - 1) // volume + 1
+
+        # Capacities congruent modulo the volume form the columns of a (rows, volume) view.
+        table = dp if every_city else dp[offered]
+        grid = table[:, :rows * volume].reshape(len(costs), rows, volume)
+
+        offsets = np.arange(rows, dtype=np.int64)[None, :, None] * costs[:, None, None]
+        keys = grid - offsets
+        running = np.minimum.accumulate(keys, axis=1)
+        # Compare in key space so that entries which are their own minimum are left untouched.
+        improved = running < keys
+        running += offsets
+        np.copyto(grid, running, where=improved)
+
+        picks = choice if every_city else choice[offered]
+        np.copyto(picks[:, :rows * volume].reshape(len(costs), rows, volume), i, where=improved)
+        if not every_city:
+            dp[offered] = table
+            choice[offered] = picks
+
+    return dp[:, :width], choice[:, :width]
+
+
+def _backtrack(dp: Sequence[int],
+               picks: Union[Sequence[int], None],
+               volumes: List[int],
+               capacity: int,
+               costs: Union[List[int], None] = None
+              ) -> Tuple[Union[int, None], Dict[int, int]]:
+    """
+    Read the cheapest fill of `capacity` from a table whose picks hold only the last box index.
+
+    Works on `_build_python` tables, on a row of a `_build_numpy` table, and on cached or
+    memory-mapped tables. Without picks, the last box at each step is any box `i` with
+    `dp[c - volumes[i]] + costs[i] == dp[c]`, which costs are integers to compare exactly.
+
+    Returns:
+        tuple: (minimum cost or None if the capacity cannot be reached,
+                dict mapping box index to count).
+    """
+    if dp[capacity] >= _UNREACHABLE:
+        return None, {}
+
+    # Backtrack: the previous capacity is always the current one minus the chosen volume.
+    counts: Dict[int, int] = {}
+    c = capacity
+    while c > 0:
+        if picks is not None:
+            i = int(picks[c])
+        else:
+            i = next(i for i, volume in enumerate(volumes)
+                     if volume <= c and dp[c - volume] + costs[i] == dp[c])
+        counts[i] = counts.get(i, 0) + 1
+        c -= volumes[i]
+
+    return int(dp[capacity]), counts
+
+
+def _plan_city(available_volumes: List[int],
+               available_costs: List[int],
+               capacity: int,
+               step: int,
+               periodic: bool = False
+              ) -> Union[Tuple[int, int, int], None]:
+    """
+    Reduce a city's request to the capacity the DP table has to reach.
+
+    Every reachable capacity is a multiple of the GCD of the available volumes, so the
+    DP runs on a grid scaled down by `step` (that GCD, or a divisor of it when several
+    cities share one grid). A capacity that is not a multiple of the city's GCD is
+    rejected before any table is allocated.
+
+    With `periodic` enabled, large capacities are reduced further. Let `b` be the box
+    with the lowest cost per volume. Any optimal fill can be rewritten to use fewer
+    than `volume(b)` other boxes (a group of `volume(b)` boxes always contains a subset
+    whose volume is a multiple of `volume(b)`, which `b` boxes fill at no higher cost).
+    Above `(volume(b) - 1) * max_volume + volume(b)` every optimal fill therefore
+    contains a `b` box, so the table only needs to cover that threshold and the rest of
+    the capacity is filled with `b` boxes directly.
+
+    Parameters:
+        available_volumes (list of int): Volume of each box available in the city.
+        available_costs (list of float): Total cost (rate multiplied by time) of each box.
+        capacity (int): The total volume capacity that must be achieved.
+        step (int): Scale of the DP grid; must divide every available volume.
+        periodic (bool): Bound the DP table by the periodicity threshold instead of the capacity.
+
+    Returns:
+        tuple or None: None if the capacity cannot be reached, otherwise
+                       (scaled capacity for the DP, index of the box used for the
+                       remainder, number of those boxes added outside the DP).
+    """
+    if capacity == 0:
+        return 0, 0, 0
+    # Greatest common divisor of the available volumes (0 when no box is available).
+    city_step = reduce(gcd, available_volumes, 0)
+    if city_step == 0 or capacity % city_step != 0:
+        return None
+
+    # Work on the scaled grid: capacity and volumes in units of `step`.
+    capacity //= step
+    volumes = [volume // step for volume in available_volumes]
+
+    # Boxes of the most cost-efficient type added outside the DP by the periodic fast path.
+    best, extra = 0, 0
+    if periodic:
+        best = min(range(len(volumes)), key=lambda i: available_costs[i] / volumes[i])
+        threshold = (volumes[best] - 1) * max(volumes) + volumes[best]
+        if capacity > threshold:
+            extra = (capacity - threshold) // volumes[best]
+            capacity -= extra * volumes[best]
+
+    return capacity, best, extra
+
+
+def _finish(solution: Tuple[Union[int, None], Dict[int, int]],
+            available_costs: List[int],
+            best: int,
+            extra: int
+           ) -> Solution:
+    """
+    Add the boxes placed outside the DP by the periodic fast path to a solution.
+    """
+    total_cost, counts = solution
+    if total_cost is None:
+        return None, []
+
+    if extra:
+        counts[best] = counts.get(best, 0) + extra
+        total_cost += extra * available_costs[best]
+
+    return total_cost, list(counts.items())
+
+
+def _map(workers: int, fn: Callable, jobs: List[Tuple]) -> List:
+    """
+    Run `fn` on every argument tuple in `jobs`, in a process pool when `workers` > 1.
+    """
+    if workers == 1 or len(jobs) < 2:
+        return [fn(*job) for job in jobs]
+    # Imported here: it is the slowest standard-library import and most calls never need it.
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(fn, *zip(*jobs)))
+
+
+def _fill_python(volumes: List[int],
+                 costs: List[int],
+                 limit: int,
+                 store_picks: bool,
+                 capacities: List[int]
+                ) -> List[Tuple[Union[int, None], Dict[int, int]]]:
+    """
+    Build a city's table up to `limit` and backtrack each of `capacities` from it.
+
+    Only the fills are returned, so the table is freed before the next city's is built
+    (and never has to be sent back from a worker process).
+    """
+    dp, choice = _build_python(volumes, costs, limit, store_picks)
+    return [_backtrack(dp, choice, volumes, capacity, costs) if capacity else (0, {})
+            for capacity in capacities]
+
+
+def _fill_numpy(volumes: List[int],
+                cost_matrix: "np.ndarray",
+                limit: int,
+                capacities: List[List[int]]
+               ) -> List[List[Tuple[Union[int, None], Dict[int, int]]]]:
+    """
+    Build a group's shared NumPy table up to `limit` and backtrack each row's `capacities`.
+
+    Like `_fill_python`, only the fills (over the shared catalog) are returned.
+    """
+    dp, choice = _build_numpy(volumes, cost_matrix, limit)
+    return [[_backtrack(dp[row], choice[row], volumes, capacity) for capacity in row_capacities]
+            for row, row_capacities in enumerate(capacities)]
+
+
+def _solve_python(cities: List[City],
+                  capacities: List[int],
+                  periodic: bool = False,
+                  cache: Union["TableCache", None] = None,
+                  workers: int = 1,
+                  store_picks: bool = True
+                 ) -> List[List[Solution]]:
+    """
+    Solve every (capacity, city) pair with one pure-Python table per city.
+
+    Each city's table is built once, up to the largest capacity it has to answer, and
+    every capacity is then a lookup plus a backtrack. Without a `cache`, each city is
+    backtracked as soon as its table is built and the table is dropped, so only one
+    table is held at a time (per worker). With a `cache`, tables are read from and
+    stored in it instead of being rebuilt on every call. With several `workers`, the
+    tables that have to be built are built in worker processes. Without `store_picks`,
+    tables hold no picks and backtracking recovers them from the costs; cached tables
+    always keep their picks.
+
+    Returns:
+        list: For each capacity, the list of solutions for each city.
+    """
+    plans = []  # For each city, the plan of every capacity.
+    city_volumes = []  # For each city, its volumes on its own GCD grid.
+    limits = {}  # Cities whose table has to reach beyond capacity 0, with the size it needs.
+    for k, (_, available_volumes, available_costs) in enumerate(cities):
+        step = reduce(gcd, available_volumes, 0)
+        plans.append([_plan_city(available_volumes, available_costs, capacity, step, periodic)
+                      for capacity in capacities])
+        city_volumes.append([volume // step for volume in available_volumes] if step else [])
+        limit = max((plan[0] for plan in plans[k] if plan is not None), default=0)
+        if limit:
+            limits[k] = limit
+
+    tables: Dict[int, Tuple[Sequence[int], Sequence[int]]] = {}
+    keys = {}
+    if cache is not None:
+        for k, limit in limits.items():
+            keys[k] = cache.key(city_volumes[k], cities[k][2])
+            table = cache.get(keys[k], limit)
+            if table is not None:
+                tables[k] = table
+
+    # For each city with a table, the fill of each of its reachable capacities, in order.
+    fills: Dict[int, List[Tuple[Union[int, None], Dict[int, int]]]] = {}
+    missing = [k for k in limits if k not in tables]
+    if cache is None:
+        jobs = [(city_volumes[k], cities[k][2], limits[k], store_picks,
+                 [plan[0] for plan in plans[k] if plan is not None]) for k in missing]
+        fills.update(zip(missing, _map(workers, _fill_python, jobs)))
+    else:
+        build = _build_python if workers == 1 else _build_python_packed
+        built = _map(workers, build, [(city_volumes[k], cities[k][2], limits[k], True)
+                                      for k in missing])
+        for k, (dp, choice) in zip(missing, built):
+            tables[k] = cache.put(keys[k], dp, choice)
+    for k, table in tables.items():
+        fills[k] = [_backtrack(*table, city_volumes[k], plan[0], cities[k][2]) if plan[0] else (0, {})
+                    for plan in plans[k] if plan is not None]
+
+    solutions: List[List[Solution]] = [[] for _ in capacities]
+    for k, (_, _, available_costs) in enumerate(cities):
+        city_fills = iter(fills.get(k, ()))
+        for answers, plan in zip(solutions, plans[k]):
+            if plan is None:
+                answers.append((None, []))
+                continue
+            _, best, extra = plan
+            fill = next(city_fills, (0, {}))
+            answers.append(_finish(fill, available_costs, best, extra))
+    return solutions
+
+
+def _solve_numpy(cities: List[City],
+                 capacities: List[int],
+                 periodic: bool = False,
+                 cache: Union["TableCache", None] = None,
+                 workers: int = 1
+                ) -> List[List[Solution]]:
+    """
+    Solve every (capacity, city) pair with shared NumPy tables, same contract as `_solve_python`.
+
+    The cities share a single grid (the GCD of every volume offered anywhere) and a
+    single catalog (every box offered by at least one city), so each box is relaxed
+    once for all cities together. Large matrices are split into groups of cities so
+    that each pass stays cache-sized. Without a `cache`, each group is backtracked as
+    soon as its table is built and the table is dropped. With a `cache`, only the cities
+    without a cached table take part in the shared pass. With several `workers`, the
+    groups are built in worker processes, with at least one group per worker.
+    """
+    # Shared catalog: every box offered by at least one city, in catalog order.
+    catalog: Dict[str, int] = {}
+    for boxes, volumes, _ in cities:
+        for box, volume in zip(boxes, volumes):
+            catalog.setdefault(box, volume)
+    names = list(catalog)
+    step = reduce(gcd, catalog.values(), 0)
+    shared_volumes = [catalog[name] // step for name in names] if step else []
+
+    plans = [[_plan_city(volumes, costs, capacity, step, periodic) for _, volumes, costs in cities]
+             for capacity in capacities]
+    # Cities whose table has to reach beyond capacity 0, with the size it needs.
+    limits = {}
+    for k in range(len(cities)):
+        limit = max((row[k][0] for row in plans if row[k] is not None), default=0)
+        if limit:
+            limits[k] = limit
+
+    # Each city's cost row over the shared catalog, `_UNREACHABLE` where the city lacks a box.
+    cost_rows = {}
+    for k in limits:
+        boxes, _, costs = cities[k]
+        row = [_UNREACHABLE] * len(names)
+        for box, cost in zip(boxes, costs):
+            row[names.index(box)] = cost
+        cost_rows[k] = row
+
+    tables: Dict[int, Tuple[Sequence[int], Sequence[int]]] = {}
+    keys = {}
+    if cache is not None:
+        for k, limit in limits.items():
+            keys[k] = cache.key(shared_volumes, cost_rows[k])
+            table = cache.get(keys[k], limit)
+            if table is not None:
+                tables[k] = table
+
+    missing = [k for k in limits if k not in tables]
+    groups = []
+    if missing:
+        width = max(limits[k] for k in missing) + max(shared_volumes)
+        group = max(1, _SHARED_PASS_CELLS // width)
+        group = min(group, -(-len(missing) // workers))
+        groups = [missing[first:first + group] for first in range(0, len(missing), group)]
+
+    # The queries each city has a non-empty table lookup for.
+    queries = {k: [q for q, plan_row in enumerate(plans) if plan_row[k] is not None and plan_row[k][0]]
+               for k in limits}
+    shared_fills: Dict[Tuple[int, int], Tuple[Union[int, None], Dict[int, int]]] = {}
+
+    np = _numpy()
+    jobs = [(shared_volumes, np.array([cost_rows[k] for k in members], dtype=np.int64),
+             max(limits[k] for k in members)) for members in groups]
+    if cache is None:
+        group_fills = _map(workers, _fill_numpy, [
+            job + ([[plans[q][k][0] for q in queries[k]] for k in members],)
+            for job, members in zip(jobs, groups)])
+        for members, rows in zip(groups, group_fills):
+            for k, row in zip(members, rows):
+                shared_fills.update(((q, k), fill) for q, fill in zip(queries[k], row))
+    else:
+        for members, (dp, choice) in zip(groups, _map(workers, _build_numpy, jobs)):
+            for row, k in enumerate(members):
+                size = limits[k] + 1
+                tables[k] = cache.put(keys[k], dp[row, :size], choice[row, :size])
+    for k, (dp_row, pick_row) in tables.items():
+        for q in queries[k]:
+            shared_fills[q, k] = _backtrack(dp_row, pick_row, shared_volumes, plans[q][k][0])
+
+    fills: Dict[Tuple[int, int], Tuple[Union[int, None], Dict[int, int]]] = {}
+    for (q, k), (total_cost, counts) in shared_fills.items():
+        # Translate shared catalog indices back into the city's own box indices.
+        boxes = cities[k][0]
+        fills[q, k] = total_cost, {boxes.index(names[i]): count for i, count in counts.items()}
+
+    solutions: List[List[Solution]] = []
+    for q, plan_row in enumerate(plans):
+        answers = []
+        for k, plan in enumerate(plan_row):
+            if plan is None:
+                answers.append((None, []))
+                continue
+            _, best, extra = plan
+            answers.append(_finish(fills.get((q, k), (0, {})), cities[k][2], best, extra))
+        solutions.append(answers)
+    return solutions
+
+
+def _split_stock(volumes: List[int],
+                 costs: List[int],
+                 stock: List[Union[int, None]]
+                ) -> List[Tuple[int, int, float, int, bool]]:
+    """
+    Turn boxes with limited stock into 0/1 items by binary splitting.
+
+    A box with stock `s` becomes items of 1, 2, 4, ... boxes plus a remainder, so every
+    count from 0 to `s` is a sum of distinct items and only O(log s) items are needed.
+    Boxes with unlimited stock (None) stay a single unbounded item.
+
+    Returns:
+        list: (box index, item volume, item cost, boxes per item, unbounded) tuples.
+    """
+    items = []
+    for i, (volume, cost, limit) in enumerate(zip(volumes, costs, stock)):
+        if limit is None:
+            items.append((i, volume, cost, 1, True))
+            continue
+        size = 1
+        while limit > 0:
+            take = min(size, limit)
+            items.append((i, take * volume, take * cost, take, False))
+            limit -= take
+            size *= 2
+    return items
+
+
+def _solve_bounded(volumes: List[int],
+                   costs: List[int],
+                   stock: List[Union[int, None]],
+                   capacity: int,
+                   vectorized: bool = False
+                  ) -> Tuple[Union[int, None], Dict[int, int]]:
+    """
+    Exact-fill DP for a single city when some boxes have limited stock.
+
+    The table is relaxed one item of `_split_stock` at a time: upwards for unbounded
+    items (a box may be added again on top of itself), downwards for 0/1 items (each
+    is used at most once). Each pass records in a bytemap which capacities it improved,
+    which is all backtracking needs: walking the items in reverse, a marked capacity
+    takes the item and moves down by its volume. The cost is O(capacity x sum(log stock))
+    rather than O(capacity x total stock). With `vectorized`, passes run on NumPy arrays.
+
+    Returns:
+        tuple: (minimum cost or None if the capacity cannot be reached,
+                dict mapping box index to count).
+    """
+    items = _split_stock(volumes, costs, stock)
+    marks = []
+
+    if vectorized:
+        np = _numpy()
+        dp = np.full(capacity + 1, _UNREACHABLE, dtype=np.int64)
+        dp[0] = 0
+        for _, volume, cost, _, unbounded in items:
+            mark = np.zeros(capacity + 1, dtype=bool)
+            if volume <= capacity and unbounded:
+                # Running minimum over each residue class, as in `_build_numpy`.
+                rows = capacity // volume + 1
+                grid = np.full(rows * volume, _UNREACHABLE, dtype=np.int64)
+                grid[:capacity + 1] = dp
+                grid = grid.reshape(rows, volume)
+                offsets = np.arange(rows, dtype=np.int64)[:, None] * cost
+                keys = grid - offsets
+                running = np.minimum.accumulate(keys, axis=0)
+                improved = (running < keys).ravel()[:capacity + 1]
+                dp[improved] = (running + offsets).ravel()[:capacity + 1][improved]
+                mark[improved] = True
+            elif volume <= capacity:
+                # The right-hand side is evaluated before the assignment, so every
+                # candidate uses the table from before this item.
+                candidates = dp[:-volume] + cost
+                improved = candidates < dp[volume:]
+                dp[volume:][improved] = candidates[improved]
+                mark[volume:] = improved
+            marks.append(mark)
+        total_cost = int(dp[capacity])
+    else:
+        dp = array("q", [_UNREACHABLE]) * (capacity + 1)
+        dp[0] = 0
+        for _, volume, cost, _, unbounded in items:
+            mark = bytearray(capacity + 1)
+            order = range(volume, capacity + 1) if unbounded else range(capacity, volume - 1, -1)
+            for j in order:
+                new_cost = dp[j - volume] + cost
+                if new_cost < dp[j]:
+                    dp[j] = new_cost
+                    mark[j] = 1
+            marks.append(mark)
+        total_cost = dp[capacity]
+
+    if total_cost >= _UNREACHABLE:
+        return None, {}
+
+    # Walk the items backwards, taking each one wherever its pass improved the table.
+    counts: Dict[int, int] = {}
+    c = capacity
+    for (i, volume, _, boxes, unbounded), mark in zip(reversed(items), reversed(marks)):
+        while mark[c]:
+            counts[i] = counts.get(i, 0) + boxes
+            c -= volume
+            if not unbounded:
+                break
+
+    return total_cost, counts
+
+
+def _solve_stocked(cities: List[City],
+                   capacity: int,
+                   stock: List[Dict[str, int]],
+                   vectorized: bool = False,
+                   workers: int = 1
+                  ) -> List[Solution]:
+    """
+    Solve every city with its stock limits, one `_solve_bounded` per city.
+    """
+    jobs = []
+    plans = []
+    for (boxes, available_volumes, available_costs), limits in zip(cities, stock):
+        # Boxes out of stock are dropped before planning, so the GCD only sees real boxes.
+        kept = [i for i, box in enumerate(boxes) if limits.get(box) != 0]
+        available_volumes = [available_volumes[i] for i in kept]
+        step = reduce(gcd, available_volumes, 0)
+        plan = _plan_city(available_volumes, [available_costs[i] for i in kept], capacity, step)
+        plans.append((kept, plan))
+        if plan is not None and plan[0]:
+            jobs.append(([volume // step for volume in available_volumes],
+                         [available_costs[i] for i in kept],
+                         [limits.get(boxes[i]) for i in kept], plan[0], vectorized))
+
+    fills = iter(_map(workers, _solve_bounded, jobs))
+    solutions: List[Solution] = []
+    for kept, plan in plans:
+        if plan is None:
+            solutions.append((None, []))
+            continue
+        total_cost, counts = next(fills) if plan[0] else (0, {})
+        if total_cost is None:
+            solutions.append((None, []))
+        else:
+            solutions.append((total_cost, [(kept[i], count) for i, count in counts.items()]))
+    return solutions
+
+
+def _sweep(volumes: List[int],
+           costs: List[int],
+           carry: Tuple[Sequence[int], Sequence[int]],
+           start: int,
+           end: int
+          ) -> Tuple[List[int], "array"]:
+    """
+    Fill dp[start:end], given what earlier entries already pushed past `start`.
+
+    Each reachable entry pushes `dp[j] + cost` to `j + volume` for every box, like
+    `_build_python`, so unreachable entries cost one comparison and ties resolve the same
+    way. A push lands at most `max(volumes)` entries ahead, so `carry` (the costs and
+    picks of dp[start:start + max(volumes)] so far) is all the earlier table that is
+    needed.
+
+    Returns:
+        tuple: (window, picks) where window[j - start] and picks[j - start] are the
+               cost and last box of j for j in start..end - 1 (final) and up to
+               `max(volumes)` further (partial: the next segment's carry).
+    """
+    reach = len(carry[0])
+    unreachable = _UNREACHABLE
+    window = list(carry[0]) + [unreachable] * (end - start)
+    picks = array(carry[1].typecode, carry[1]) + _pick_array(len(volumes), end - start)
+    if start == 0:
+        window[0] = 0  # Base case: zero cost to achieve zero capacity.
+    boxes = list(zip(range(len(volumes)), volumes, costs))
+    for position in range(end - start):
+        cost = window[position]
+        if cost != unreachable:
+            for i, volume, box_cost in boxes:
+                new_cost = cost + box_cost
+                if new_cost < window[position + volume]:
+                    window[position + volume] = new_cost
+                    picks[position + volume] = i
+    del window[end - start + reach:], picks[end - start + reach:]
+    return window, picks
+
+
+def _solve_checkpointed(volumes: List[int],
+                        costs: List[int],
+                        capacity: int
+                       ) -> Tuple[Union[int, None], Dict[int, int]]:
+    """
+    Exact-fill DP for a single city in memory independent of the capacity's full table.
+
+    The table is swept in segments of about `sqrt(max(volumes) * capacity)` entries,
+    keeping only the `max(volumes)` entries pushed past the segment between segments.
+    That carry is saved as a checkpoint at the start of every segment. Backtracking
+    walks the segments from the last one down, recomputing each segment's picks from its
+    checkpoint; since the backtrack only moves down, each segment is recomputed at most
+    once. The cost is two sweeps of the table, and memory is O(max(volumes) x
+    checkpoints + segment length), i.e. O(sqrt(max(volumes) x capacity)) instead of
+    O(capacity).
+
+    Returns:
+        tuple: (minimum cost or None if the capacity cannot be reached,
+                dict mapping box index to count).
+    """
+    reach = max(volumes)
+    segment = max(reach, isqrt(reach * (capacity + 1)))
+    carry = (array("q", [_UNREACHABLE]) * reach, _pick_array(len(volumes), reach))
+    checkpoints = []
+    for start in range(0, capacity + 1, segment):
+        checkpoints.append(carry)
+        end = min(start + segment, capacity + 1)
+        window, picks = _sweep(volumes, costs, carry, start, end)
+        carry = (array("q", window[end - start:]), picks[end - start:])
+
+    total_cost = window[capacity - start]
+    if total_cost >= _UNREACHABLE:
+        return None, {}
+
+    # Backtrack segment by segment, recomputing each one's picks from its checkpoint.
+    counts: Dict[int, int] = {}
+    c = capacity
+    while c > 0:
+        start = c // segment * segment
+        _, picks = _sweep(volumes, costs, checkpoints[c // segment], start, c + 1)
+        while c >= start and c > 0:
+            i = picks[c - start]
+            counts[i] = counts.get(i, 0) + 1
+            c -= volumes[i]
+
+    return total_cost, counts
+
+
+def _solve_low_memory(cities: List[City],
+                      capacity: int,
+                      periodic: bool = False,
+                      workers: int = 1
+                     ) -> List[Solution]:
+    """
+    Solve every city with `_solve_checkpointed`, on its GCD grid and periodic plan.
+    """
+    jobs = []
+    plans = []
+    for _, available_volumes, available_costs in cities:
+        step = reduce(gcd, available_volumes, 0)
+        plan = _plan_city(available_volumes, available_costs, capacity, step, periodic)
+        plans.append(plan)
+        if plan is not None and plan[0]:
+            jobs.append(([volume // step for volume in available_volumes], available_costs, plan[0]))
+
+    fills = iter(_map(workers, _solve_checkpointed, jobs))
+    solutions: List[Solution] = []
+    for (_, _, available_costs), plan in zip(cities, plans):
+        if plan is None:
+            solutions.append((None, []))
+            continue
+        fill = next(fills) if plan[0] else (0, {})
+        solutions.append(_finish(fill, available_costs, plan[1], plan[2]))
+    return solutions
+
+
+def _cover(volumes: List[int],
+           costs: List[int],
+           capacity: int,
+           vectorized: bool = False
+          ) -> Tuple[Union[int, None], Dict[int, int]]:
+    """
+    Cheapest fill of at least `capacity` for a single city.
+
+    Removing any box from a fill that overshoots by `max(volumes)` or more still covers
+    the capacity at no higher cost, so the table only has to reach
+    `capacity + max(volumes) - 1`. The pure-Python sweep finalizes dp[j] when it reaches
+    j, and stops early once j times the best cost per volume is no cheaper than the best
+    covering fill found so far, since no larger capacity can then beat it. With
+    `vectorized`, the table is built with `_build_numpy` and scanned at once.
+
+    Returns:
+        tuple: (minimum cost or None if no box is available,
+                dict mapping box index to count).
+    """
+    limit = capacity + max(volumes) - 1
+
+    if vectorized:
+        np = _numpy()
+        dp, choice = _build_numpy(volumes, np.array([costs], dtype=np.int64), limit)
+        target = capacity + int(np.argmin(dp[0, capacity:]))
+        return _backtrack(dp[0], choice[0], volumes, target)
+
+    # Lowest cost per unit of volume: no fill of j units can cost less than j times this.
+    best_ratio = min(cost / volume for volume, cost in zip(volumes, costs))
+
+    n = len(volumes)
+    dp = array("q", [_UNREACHABLE]) * (limit + 1)
+    dp[0] = 0
+    choice = _pick_array(n, limit + 1)
+    target = None
+
+    for j in range(limit + 1):
+        if j >= capacity:
+            # dp[j] is final: every box reaching j was added from a smaller capacity.
+            if target is None or dp[j] < dp[target]:
+                target = j
+            if j * best_ratio >= dp[target]:
+                break
+        if dp[j] != _UNREACHABLE:
+            for i in range(n):
+                new_volume = j + volumes[i]
+                if new_volume <= limit:
+                    new_cost = dp[j] + costs[i]
+                    if new_cost < dp[new_volume]:
+                        dp[new_volume] = new_cost
+                        choice[new_volume] = i
+
+    return _backtrack(dp, choice, volumes, target)
+
+
+def _solve_covering(cities: List[City],
+                    capacity: int,
+                    vectorized: bool = False,
+                    workers: int = 1
+                   ) -> List[Solution]:
+    """
+    Solve every city in "at least capacity" mode, one `_cover` per city.
+    """
+    jobs = []
+    for _, available_volumes, available_costs in cities:
+        step = reduce(gcd, available_volumes, 0)
+        if step and capacity:
+            # On the GCD grid, "at least capacity" means at least ceil(capacity / step).
+            jobs.append(([volume // step for volume in available_volumes], available_costs,
+                         -(-capacity // step), vectorized))
+
+    fills = iter(_map(workers, _cover, jobs))
+    solutions: List[Solution] = []
+    for _, available_volumes, _ in cities:
+        if capacity == 0:
+            solutions.append((0, []))
+        elif not available_volumes:
+            solutions.append((None, []))
+        else:
+            total_cost, counts = next(fills)
+            solutions.append((total_cost, list(counts.items())))
+    return solutions
+
+
+def _format_output(regions: Iterable[str],
+                   cities: List[City],
+                   solutions: List[Solution],
+                   time: Union[int, None] = None
+                  ) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Build the {"Output": [...]} result, multiplying costs by `time` when they are per-hour
+    rates and converting them from minor units back to currency units.
+    """
+    results = []  # List to hold the results for each city
+
+    for city, (available_boxes, _, _), (best_cost, counts) in zip(regions, cities, solutions):
+        # Translate box indices back into names.
+        selected_boxes = {}
+        if best_cost is None:
+            total_cost: Union[float, str] = "No solution"
+        else:
+            total_cost = _from_minor(best_cost if time is None else best_cost * time)
+            for i, count in counts:
+                selected_boxes[available_boxes[i]] = count
+
+        # Append the result for the current city.
+        results.append({
+            "region": city,
+            "total_cost": total_cost,
+            "boxes": selected_boxes 
+        })
+
+    return {"Output": results}
+
+
+def _rank_cities(cities: List[City],
+                 capacity: int,
+                 k: int,
+                 solve: Callable[[List[int]], List[Solution]],
+                 exact: bool = True,
+                 batch: int = 1
+                ) -> List[Tuple[int, Solution]]:
+    """
+    Find the `k` cheapest cities, solving as few of them as possible.
+
+    No fill of `capacity` can cost less than `capacity` times the city's lowest cost per
+    volume. Cities are solved in increasing order of that bound, `batch` at a time, and
+    the search stops as soon as the next bound is no lower than the k-th best cost found,
+    since none of the remaining cities can then make the ranking.
+
+    Parameters:
+        cities (list): Filtered cities, as built by `_filter_cities`.
+        capacity (int): The total volume capacity that must be achieved.
+        k (int): Number of cities to rank.
+        solve (callable): Solves the cities at the given indices, returning their solutions.
+        exact (bool): Whether capacities off a city's GCD grid are unreachable.
+        batch (int): Number of cities solved per round.
+
+    Returns:
+        list: Up to `k` (city index, solution) pairs, cheapest first.
+    """
+    bounds = []
+    for index, (_, volumes, costs) in enumerate(cities):
+        step = reduce(gcd, volumes, 0)
+        if capacity and (step == 0 or (exact and capacity % step)):
+            continue  # No solution, whatever the prices.
+        best_ratio = min((cost / volume for volume, cost in zip(volumes, costs)), default=0)
+        # Shave off a rounding margin so that a float bound never exceeds the true optimum.
+        bounds.append((capacity * best_ratio * (1 - 1e-12), index))
+    bounds.sort()
+
+    ranked: List[Tuple[float, int, Solution]] = []
+    position = 0
+    while position < len(bounds):
+        kth_cost = ranked[k - 1][0] if len(ranked) >= k else float('inf')
+        if bounds[position][0] >= kth_cost:
+            break
+        indices = [index for _, index in bounds[position:position + batch]]
+        position += batch
+        for index, solution in zip(indices, solve(indices)):
+            if solution[0] is not None:
+                ranked.append((solution[0], index, solution))
+        ranked.sort(key=lambda entry: (entry[0], entry[1]))
+
+    return [(index, solution) for _, index, solution in ranked[:k]]
+
+
+def _check_options(backend: str, workers: int) -> None:
+    """
+    Validate the backend name, that its dependencies are installed, and the worker count.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}.")
+    if backend == "numpy" and _numpy() is None:
+        raise ImportError("The numpy backend requires NumPy to be installed.")
+    if workers < 1:
+        raise ValueError("workers must be a positive integer.")
+
+
+def _check_range(cities: List[City], capacity: int, at_least: bool = False) -> None:
+    """
+    Reject a quote whose totals could reach `_UNREACHABLE`.
+
+    A fill of `capacity` uses at most `capacity // smallest volume` boxes, each costing
+    at most the dearest box, so while that product stays below the sentinel every total
+    is exact and fits the int64 tables. Covering fills reach one box further.
+    """
+    for _, volumes, costs in cities:
+        if not volumes:
+            continue
+        reach = capacity + max(volumes) - 1 if at_least else capacity
+        if max(costs) * max(1, reach // min(volumes)) >= _UNREACHABLE:
+            raise ValueError("Costs are too large to quote exactly; "
+                             "use a smaller time or capacity.")
+
+
+def _table_work(city: City,
+                capacity: int,
+                periodic: bool = False,
+                at_least: bool = False,
+                limits: Union[Dict[str, int], None] = None
+               ) -> Tuple[int, int, int]:
+    """
+    Size of the DP table a city needs and the relaxations that fill it.
+
+    Computed from the request alone, so profiling adds no work to the DP loops. A
+    relaxation is one (capacity, box) transition: the exact-fill and covering DPs try
+    every box from every capacity of the table (the pure-Python loops skip unreachable
+    capacities, so for them this is an upper bound), and the stock-limited DP makes one
+    pass per binary-split item. Covering tables are counted to their full length, before
+    the early stop.
+
+    Returns:
+        tuple: (table entries, relaxations, boxes added outside the table by the periodic
+                fast path).
+    """
+    boxes, volumes, costs = city
+    if limits is not None:
+        kept = [i for i, box in enumerate(boxes) if limits.get(box) != 0]
+        volumes, costs = [volumes[i] for i in kept], [costs[i] for i in kept]
+    step = reduce(gcd, volumes, 0)
+    if capacity == 0 or step == 0:
+        return 0, 0, 0
+    scaled = [volume // step for volume in volumes]
+
+    if at_least:
+        size = -(-capacity // step) + max(scaled)
+        return size, size * len(scaled), 0
+    plan = _plan_city(volumes, costs, capacity, step, periodic and limits is None)
+    if plan is None:
+        return 0, 0, 0
+    size = plan[0] + 1
+    if limits is None:
+        return size, size * len(scaled), plan[2]
+    stock = [limits.get(boxes[i]) for i in kept]
+    return size, size * len(_split_stock(scaled, costs, stock)), 0
+
+
+def _profile(solve: Callable[[List[int]], List[Solution]],
+             records: List[Dict[str, Any]],
+             work: Callable[[int], Tuple[int, int, int]],
+             regions: List[str]
+            ) -> Callable[[List[int]], List[Solution]]:
+    """
+    Wrap `solve` to solve cities one at a time and append a stats record for each.
+
+    Each record holds the city's wall time, the peak memory traced while solving it, the
+    size of its table, the relaxations made, and the length of its backtrack.
+    """
+    def profiled(indices: List[int]) -> List[Solution]:
+        solutions = []
+        for k in indices:
+            tracemalloc.reset_peak()
+            start = timer.perf_counter()
+            solution = solve([k])[0]
+            seconds = timer.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            table_size, relaxations, extra = work(k)
+            records.append({
+                "region": regions[k],
+                "seconds": seconds,
+                "peak_memory_bytes": peak,
+                "table_size": table_size,
+                "relaxations": relaxations,
+                "backtrack_length": sum(count for _, count in solution[1]) - extra,
+            })
+            solutions.append(solution)
+        return solutions
+
+    return profiled
+
+
 def minimize_cost(time: int, 
                   capacity: int, 
                   box_sizes: List[Tuple[str, int]], 
-                  city_costs: Dict[str, Dict[str, Union[float, None]]]
-                 ) -> Dict[str, List[Dict[str, Any]]]:
+                  city_costs: Dict[str, Dict[str, Union[float, None]]],
+                  periodic: bool = False,
+                  backend: str = "python",
+                  cache: Union["TableCache", None] = None,
+                  workers: int = 1,
+                  stock: Union[Dict[str, Dict[str, int]], None] = None,
+                  at_least: bool = False,
+                  top_k: Union[int, None] = None,
+                  store_picks: bool = True,
+                  stats: bool = False,
+                  schedule: Union[Dict[str, Schedule], None] = None,
+                  start: int = 0,
+                  low_memory: bool = False
+                 ) -> Dict[str, Any]:
     """
     Determine the minimum cost for fulfilling a given capacity using available boxes,
     considering different cost rates per city.
@@ -37,6 +1200,62 @@ def minimize_cost(time: int,
         box_sizes (list of tuples): A list where each tuple consists of (box_name, box_volume).
         city_costs (dict): A dictionary mapping each city name to another dictionary,
                            which in turn maps a box type to its cost per hour.
+        periodic (bool): Solve the DP only up to a threshold tied to the largest box volume
+                         and fill the rest of the capacity with the most cost-efficient box.
+                         Time and memory no longer grow with the capacity; the total cost is
+                         the same, but when several fills tie the breakdown may be a
+                         different optimal one.
+        backend (str): "python" (default) for the pure-Python DP, or "numpy" for the
+                       vectorized engine, which requires NumPy to be installed and
+                       solves all cities in a single shared pass.
+        cache (TableCache): Optional `table_cache.TableCache` holding per-city DP tables.
+                            Tables are keyed on the box volumes and costs, so repeated
+                            calls with the same prices skip the DP, and a price change
+                            never reads a stale table.
+        workers (int): Number of processes building tables. Above 1, the cities (or, with
+                       the numpy backend, groups of cities) are solved in a
+                       ProcessPoolExecutor and their tables are sent back as typed arrays.
+        stock (dict): Optional limits on the number of boxes of each type, per city,
+                      e.g. {"Delhi": {"XL": 3}}. Boxes or cities left out are unlimited;
+                      counts must be non-negative integers and cities must be in
+                      `city_costs`.
+                      Limited boxes are binary-split into O(log stock) 0/1 items, so the
+                      solve stays close to the unlimited one. Stock-limited solves do
+                      not use the cache and cannot be combined with `periodic`, whose
+                      shortcut assumes unlimited boxes.
+        at_least (bool): Quote the cheapest fill of at least `capacity` instead of exactly
+                         `capacity`; a city only has no solution when it offers no box.
+                         The DP extends to `capacity` plus the largest box volume and
+                         stops as soon as no larger fill can be cheaper. Cannot be
+                         combined with `periodic` or `stock`, and does not use the cache.
+        top_k (int): Only return the `top_k` cheapest cities, cheapest first, leaving out
+                     cities with no solution. Cities are solved in increasing order of a
+                     lower bound (capacity times their best cost per volume) and the rest
+                     are skipped once they cannot beat the k-th best cost found.
+        store_picks (bool): Keep the index of the last box added at each capacity (one
+                            byte per capacity) for backtracking. With False, the pure-
+                            Python engine stores only the costs and recovers each box
+                            from them while backtracking, trying every box per step.
+                            Ignored with a cache and by the numpy backend.
+        stats (bool): Also return a "Stats" entry profiling the call. Cities are then
+                      solved one at a time (so each can be timed) under tracemalloc, which
+                      slows the solve down; memory used by worker processes is not traced.
+                      Off by default, in which case nothing is measured.
+        schedule (dict): Optional time-varying rates per city, e.g.
+                         {"Delhi": [(8, peak_rates), (16, off_peak_rates)]}: windows of
+                         (hours, cost per hour of each box) that repeat once their hours
+                         run out. The quote covers `time` hours from hour `start` of the
+                         schedule. Each box's rates are folded into one total cost, so a
+                         single DP covers every window. Cities without a schedule use
+                         `city_costs`.
+        start (int): Hour of the schedule at which the quote begins.
+        low_memory (bool): Solve each city without keeping its whole table: costs are
+                           swept in segments carrying only the next `max volume` entries,
+                           checkpointed at each segment, and the breakdown is rebuilt by
+                           recomputing segments while backtracking. Memory drops from
+                           O(capacity) to O(sqrt(max volume x capacity)) for about 1.5
+                           times the time. Pure-Python only; does not use the cache and
+                           cannot be combined with `stock` or `at_least`.
                            
     Returns:
         dict: A dictionary with a key "Output" that contains a list of results. Each result 
@@ -44,96 +1263,280 @@ def minimize_cost(time: int,
                 - "region": The name of the city.
                 - "total_cost": The computed minimum cost (or "No solution" if capacity cannot be reached).
                 - "boxes": A dictionary with the count of each box type used.
+              With `stats`, a key "Stats" holds "seconds" and "peak_memory_bytes" for the
+              whole call and a "cities" list with, for each city solved (cities skipped
+              by `top_k` are left out): "region", "seconds", "peak_memory_bytes",
+              "table_size" (DP entries), "relaxations" ((capacity, box) transitions) and
+              "backtrack_length" (boxes read back from the table).
     """
 
     # Validate inputs
     if time < 0 or capacity < 0:
         raise ValueError("Time and capacity must be non-negative integers.")
-    
-    results = []  # List to hold the results for each city
+    _check_options(backend, workers)
+    if at_least and (periodic or stock is not None):
+        raise ValueError("at_least cannot be combined with periodic or stock limits.")
+    if low_memory and (at_least or stock is not None or backend != "python"):
+        raise ValueError("low_memory only applies to exact fills with the python backend.")
+    if stock is not None:
+        if periodic:
+            raise ValueError("periodic cannot be combined with stock limits.")
+        unknown = set(stock) - set(city_costs)
+        if unknown:
+            raise ValueError(f"Stock limits for unknown regions: {sorted(unknown)}.")
+        for limits in stock.values():
+            for count in limits.values():
+                if count is not None and (not isinstance(count, int) or isinstance(count, bool)
+                                          or count < 0):
+                    raise ValueError("Stock counts must be non-negative integers.")
 
-    # Process each city separately
-    for city, cost_table in city_costs.items():
-        # Prepare lists for boxes that have valid costs in this city.
-        available_boxes = []
-        available_volumes = []
-        available_costs = []
-        
-        # Filter box_sizes based on availability in the current city's cost table.
-        for box, size in box_sizes:
-            # Check if the cost exists and is not None
-            if box in cost_table and cost_table[box] is not None:
-                available_boxes.append(box)
-                available_volumes.append(size)
-                # Multiply the cost per hour by the total time to get the total cost for that box.
-                available_costs.append(cost_table[box] * time)
-
-        n = len(available_boxes)
-        # dp[j] will store the minimum cost to exactly achieve capacity j.
-        dp = [float('inf')] * (capacity + 1)
-        dp[0] = 0  # Base case: zero cost to achieve zero capacity.
-
-        # choice[j] records a tuple (i, prev_j) to help trace back which box was added
-        # to achieve capacity j from a previous capacity prev_j.
-        choice = [None] * (capacity + 1)
-
-        # For each intermediate capacity j, try adding each box.
-        for j in range(capacity + 1):
-            if dp[j] != float('inf'):
-                for i in range(n):
-                    new_volume = j + available_volumes[i]
-                    if new_volume <= capacity:
-                        new_cost = dp[j] + available_costs[i]
-                        if new_cost < dp[new_volume]:
-                            dp[new_volume] = new_cost
-                            choice[new_volume] = (i, j)  # Store the index of the box and previous capacity.
-
-        # Backtrack from dp[capacity] to determine the count of each box used.
-        selected_boxes = {}
-        if dp[capacity] == float('inf'):
-            total_cost: Union[float, str] = "No solution"
-        else:
-            total_cost = dp[capacity]
-            c = capacity
-            while c > 0 and choice[c] is not None:
-                i, prev_c = choice[c]
-                box_name = available_boxes[i]
-                selected_boxes[box_name] = selected_boxes.get(box_name, 0) + 1
-                c = prev_c  # Move to the previous capacity state.
+    if top_k is not None and top_k < 1:
+        raise ValueError("top_k must be a positive integer.")
 
-        # Append the result for the current city.
-        results.append({
-            "region": city,
-            "total_cost": total_cost,
-            "boxes": selected_boxes 
-        })
+    if start < 0:
+        raise ValueError("start must be a non-negative integer.")
+    if schedule is not None:
+        # Fold each rate schedule into one total cost per box for the whole quote.
+        cities = _filter_cities(box_sizes, _schedule_costs(city_costs, schedule, time, start), 1)
+    else:
+        cities = _filter_cities(box_sizes, city_costs, time)
+    _check_range(cities, capacity, at_least)
+    regions = list(city_costs)
 
-    return {"Output": results}
+    def solve(indices: List[int]) -> List[Solution]:
+        subset = [cities[k] for k in indices]
+        if at_least:
+            # Covering mode: cheapest fill of at least the capacity.
+            return _solve_covering(subset, capacity, backend == "numpy", workers)
+        if stock is not None:
+            # Bounded inventory: one DP per city over the binary-split boxes.
+            city_stock = [stock.get(regions[k], {}) for k in indices]
+            return _solve_stocked(subset, capacity, city_stock, backend == "numpy", workers)
+        if low_memory:
+            # Checkpointed sweeps instead of full tables.
+            return _solve_low_memory(subset, capacity, periodic, workers)
+        # Solve the exact-fill DP: one shared pass with NumPy, otherwise one DP per city.
+        if backend == "numpy":
+            return _solve_numpy(subset, [capacity], periodic, cache, workers)[0]
+        return _solve_python(subset, [capacity], periodic, cache, workers, store_picks)[0]
+
+    def respond(solve: Callable[[List[int]], List[Solution]]) -> Dict[str, Any]:
+        if top_k is None:
+            return _format_output(regions, cities, solve(list(range(len(cities)))))
+
+        # Ranking: solve cities in order of their lower bound until the rest cannot compete.
+        ranked = _rank_cities(cities, capacity, top_k, solve, exact=not at_least, batch=workers)
+        return _format_output([regions[k] for k, _ in ranked], [cities[k] for k, _ in ranked],
+                              [solution for _, solution in ranked])
 
+    if not stats:
+        return respond(solve)
 
-def process_cmd_args() -> Tuple[int, int]:
+    # Profiling: time each city separately, with memory traced for the whole call.
+    records: List[Dict[str, Any]] = []
+
+    def work(k: int) -> Tuple[int, int, int]:
+        limits = None if stock is None else stock.get(regions[k], {})
+        return _table_work(cities[k], capacity, periodic, at_least, limits)
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        began = timer.perf_counter()
+        result = respond(_profile(solve, records, work, regions))
+        seconds = timer.perf_counter() - began
+        peak = max((record["peak_memory_bytes"] for record in records), default=0)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    result["Stats"] = {"seconds": seconds, "peak_memory_bytes": peak, "cities": records}
+    return result
+
+
+def minimize_cost_batch(queries: List[Tuple[int, int]],
+                        box_sizes: List[Tuple[str, int]],
+                        city_costs: Dict[str, Dict[str, Union[float, None]]],
+                        periodic: bool = False,
+                        backend: str = "python",
+                        cache: Union["TableCache", None] = None,
+                        workers: int = 1
+                       ) -> List[Dict[str, List[Dict[str, Any]]]]:
     """
-    Parse command line arguments for time and capacity.
+    Answer many (time, capacity) quotes against the same boxes and prices.
+
+    `time` only multiplies every box cost by the same factor, so the cheapest fill does
+    not depend on it. Each city's table is built once on the hourly rates, up to the
+    largest requested capacity, and every query is answered by a lookup and a backtrack,
+    with the cost multiplied by the query's time afterwards. For a time of 0 every fill
+    is free; the breakdown reported is the cheapest fill at the hourly rates.
+
+    Parameters:
+        queries (list of tuples): (time, capacity) pairs, as passed to `minimize_cost`.
+        box_sizes (list of tuples): A list where each tuple consists of (box_name, box_volume).
+        city_costs (dict): A dictionary mapping each city name to another dictionary,
+                           which in turn maps a box type to its cost per hour.
+        periodic (bool): See `minimize_cost`.
+        backend (str): See `minimize_cost`.
+        cache (TableCache): See `minimize_cost`. Tables are built on hourly rates, so
+                            one cached table serves every time multiplier.
+        workers (int): See `minimize_cost`.
+
+    Returns:
+        list: One `minimize_cost`-style {"Output": [...]} result per query, in query order.
     """
-    try:
-        time_input = int(sys.argv[1])
-        capacity_input = int(sys.argv[2])
-    except ValueError:
-        print("Invalid input. Please provide integers for time and capacity.")
-        sys.exit(1)
+    for time, capacity in queries:
+        if time < 0 or capacity < 0:
+            raise ValueError("Time and capacity must be non-negative integers.")
+    _check_options(backend, workers)
 
-    return time_input, capacity_input
+    # Hourly rates: the costs for a time of 1.
+    cities = _filter_cities(box_sizes, city_costs, 1)
+    capacities = sorted({capacity for _, capacity in queries})
+    _check_range(cities, capacities[-1] if capacities else 0)
+
+    solve = _solve_numpy if backend == "numpy" else _solve_python
+    by_capacity = dict(zip(capacities, solve(cities, capacities, periodic, cache, workers)))
+
+    return [_format_output(city_costs, cities, by_capacity[capacity], time)
+            for time, capacity in queries]
+
+
+def _parse_request(line: str, max_capacity: Union[int, None] = None) -> Dict[str, Any]:
+    """
+    Parse one JSONL request of the form {"time": int, "capacity": int, "id": optional}.
+    """
+    request = json.loads(line)
+    if not isinstance(request, dict):
+        raise ValueError("Each request must be a JSON object.")
+    for field in ("time", "capacity"):
+        value = request.get(field)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"'{field}' must be a non-negative integer.")
+    if max_capacity is not None and request["capacity"] > max_capacity:
+        raise ValueError(f"'capacity' must be at most {max_capacity}.")
+    return request
 
-if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python main.py <time_input> <capacity_input>")
-        sys.exit(1)
 
+def stream_quotes(lines: Iterable[str],
+                  output: TextIO,
+                  box_sizes: List[Tuple[str, int]],
+                  city_costs: Dict[str, Dict[str, Union[float, None]]],
+                  chunk_size: int = 1024,
+                  periodic: bool = False,
+                  backend: str = "python",
+                  cache: Union["TableCache", None] = None,
+                  workers: int = 1,
+                  max_capacity: Union[int, None] = None
+                 ) -> int:
+    """
+    Answer newline-delimited JSON requests and write one compact JSON result per line.
+
+    Requests are read `chunk_size` lines at a time and each chunk is solved with
+    `minimize_cost_batch`, so a chunk costs one table build per city at most. Tables
+    are kept in `cache` between chunks, so later chunks only rebuild a city's table when
+    they need a larger capacity than any seen before. The default in-memory `TableCache`
+    holds one table per region; a smaller cache passed in may evict tables between
+    chunks. Results are written and flushed as each chunk completes, in input order.
+    A request's "id", if present, is echoed back; a malformed line, or one asking for
+    more than `max_capacity`, produces an {"error": ...} line instead of stopping the
+    stream. Blank lines are skipped.
+
+    Parameters:
+        lines (iterable of str): JSONL requests, e.g. an open file or sys.stdin.
+        output (file): Where the JSONL results are written.
+        box_sizes (list of tuples): A list where each tuple consists of (box_name, box_volume).
+        city_costs (dict): A dictionary mapping each city name to another dictionary,
+                           which in turn maps a box type to its cost per hour.
+        chunk_size (int): Number of requests solved together.
+        periodic, backend, workers: See `minimize_cost`.
+        cache (TableCache): Tables shared between chunks (and with other callers).
+        max_capacity (int): Optional largest capacity a request may ask for.
+
+    Returns:
+        int: The number of result lines written.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    if cache is None:
+        cache = TableCache(max_tables=max(128, len(city_costs)))
+
+    requests = (line for line in lines if line.strip())
+    written = 0
+    while True:
+        chunk = list(islice(requests, chunk_size))
+        if not chunk:
+            return written
+
+        parsed: List[Union[Dict[str, Any], str]] = []
+        for line in chunk:
+            try:
+                parsed.append(_parse_request(line, max_capacity))
+            except ValueError as error:  # json.JSONDecodeError is a ValueError too
+                parsed.append(str(error))
+
+        valid = [request for request in parsed if isinstance(request, dict)]
+        answers = iter(minimize_cost_batch([(r["time"], r["capacity"]) for r in valid],
+                                           box_sizes, city_costs, periodic, backend, cache, workers))
+        for request in parsed:
+            if isinstance(request, dict):
+                result = next(answers)
+                if "id" in request:
+                    result = {"id": request["id"], **result}
+            else:
+                result = {"error": request}
+            output.write(json.dumps(result, separators=(",", ":")) + "\n")
+        output.flush()
+        written += len(parsed)
+
+
+def process_cmd_args(argv: Union[List[str], None] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments for time, capacity and solver options.
+    """
+    parser = argparse.ArgumentParser(
+        description="Minimum cost box allocation for each city.",
+        usage="python main.py <time_input> <capacity_input> [--prices FILE] [--workers N] [--low-memory]\n"
+              "       python main.py --stream FILE [--prices FILE] [--workers N]",
+    )
+    parser.add_argument("time_input", type=int, nargs="?", help="Number of hours the boxes are needed.")
+    parser.add_argument("capacity_input", type=int, nargs="?", help="Total capacity required.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Number of processes solving the cities in parallel (default: 1).")
+    parser.add_argument("--prices", metavar="FILE",
+                        help="Load the box catalog and city prices from a .json, .csv or "
+                             "compiled .pbk price book instead of the built-in tables.")
+    parser.add_argument("--stream", metavar="FILE",
+                        help="Read JSONL requests ({\"time\": .., \"capacity\": ..}) from FILE, "
+                             "or stdin for '-', and write one JSON result per line.")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Keep memory independent of the full table size (about 1.5 times as slow).")
+    args = parser.parse_args(argv)
+    if args.stream is None and (args.time_input is None or args.capacity_input is None):
+        parser.error("time_input and capacity_input are required unless --stream is given.")
+    if args.stream is not None and args.time_input is not None:
+        parser.error("time_input and capacity_input cannot be combined with --stream.")
+    return args
+
+if __name__ == "__main__":
     # Number of hours the boxes are needed, Total capacity required.
-    time_input,capacity_input = process_cmd_args()
+    args = process_cmd_args()
+
+    if args.prices is not None:
+        # Replace the built-in tables with an external price book.
+        box_sizes, city_costs = pricebook.load(args.prices)
+
+    if args.stream is not None:
+        # Re-price a stream of requests, reusing the tables between lines.
+        source = sys.stdin if args.stream == "-" else open(args.stream)
+        with source:
+            stream_quotes(source, sys.stdout, box_sizes, city_costs, workers=args.workers)
+        sys.exit(0)
 
     # Calculate the minimum cost and the box allocation for each city.
-    result = minimize_cost(time_input, capacity_input, box_sizes, city_costs)
+    result = minimize_cost(args.time_input, args.capacity_input, box_sizes, city_costs,
+                           workers=args.workers, low_memory=args.low_memory)
 
     # Format and print the result in JSON format for readability.
     print(json.dumps(result, indent=2))
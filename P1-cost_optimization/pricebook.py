@@ -0,0 +1,176 @@
+import csv
+import json
+import math
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Tuple, Union
+
+
+# Fixed-size header of a compiled price book: magic, number of boxes, number of regions
+# and the length of the UTF-8 JSON block holding the box and region names.
+_MAGIC = b"PBK1"
+_HEADER = struct.Struct("<4sIIQ")
+
+
+def validate(box_sizes: List[Tuple[str, int]],
+             city_costs: Mapping) -> None:
+    """
+    Check that every box volume is a positive integer and every cost a finite,
+    non-negative number (or None where the box is not offered).
+
+    The solvers divide by volumes and compare costs, so a zero volume or a negative
+    or NaN cost would fail deep inside a solve or give a meaningless quote.
+
+    Raises:
+        ValueError: Naming the first invalid box or cost.
+    """
+    for box, volume in box_sizes:
+        if volume <= 0:
+            raise ValueError(f"Box {box!r} must have a positive volume, got {volume}.")
+    for region, cost_table in city_costs.items():
+        for box, cost in cost_table.items():
+            if cost is not None and not (math.isfinite(cost) and cost >= 0):
+                raise ValueError(f"Cost of {box!r} in {region!r} must be a finite, "
+                                 f"non-negative number, got {cost}.")
+
+
+def load_json(path: str) -> Tuple[List[Tuple[str, int]], Dict[str, Dict[str, Union[float, None]]]]:
+    """
+    Load a price book from JSON.
+
+    The file holds an object with "box_sizes", a list of [box_name, box_volume] pairs,
+    and "city_costs", mapping each region to its cost per hour for each box (null or
+    missing when the box is not offered), in the same shape as the globals in main.py.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    box_sizes = [(name, int(volume)) for name, volume in data["box_sizes"]]
+    validate(box_sizes, data["city_costs"])
+    return box_sizes, data["city_costs"]
+
+
+def load_csv(path: str) -> Tuple[List[Tuple[str, int]], Dict[str, Dict[str, Union[float, None]]]]:
+    """
+    Load a price book from CSV with one row per (region, box): region,box,volume,cost.
+
+    An empty cost means the box is not offered in that region. Boxes are ordered by
+    descending volume, like the catalog in main.py.
+    """
+    volumes: Dict[str, int] = {}
+    city_costs: Dict[str, Dict[str, Union[float, None]]] = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            box, volume = row["box"], int(row["volume"])
+            if volumes.setdefault(box, volume) != volume:
+                raise ValueError(f"Box {box!r} has conflicting volumes in {path}.")
+            cost = row["cost"].strip()
+            city_costs.setdefault(row["region"], {})[box] = float(cost) if cost else None
+    box_sizes = sorted(volumes.items(), key=lambda item: -item[1])
+    validate(box_sizes, city_costs)
+    return box_sizes, city_costs
+
+
+def compile_pricebook(box_sizes: List[Tuple[str, int]],
+                      city_costs: Dict[str, Dict[str, Union[float, None]]],
+                      path: str) -> None:
+    """
+    Write a price book in the compiled binary format read by `load_compiled`.
+
+    Layout (little-endian): the header, the names as a UTF-8 JSON block padded to 8
+    bytes, the box volumes as int64, then a regions x boxes float64 cost matrix with
+    NaN where a box is not offered.
+    """
+    # NaN marks a box that is not offered, so a NaN cost must not get this far.
+    validate(box_sizes, city_costs)
+    boxes = [name for name, _ in box_sizes]
+    regions = list(city_costs)
+    names = json.dumps({"boxes": boxes, "regions": regions}).encode()
+    names += b" " * (-len(names) % 8)
+
+    costs = array("d")
+    for region in regions:
+        cost_table = city_costs[region]
+        for box in boxes:
+            cost = cost_table.get(box)
+            costs.append(math.nan if cost is None else cost)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(boxes), len(regions), len(names)))
+        f.write(names)
+        f.write(array("q", [volume for _, volume in box_sizes]).tobytes())
+        f.write(costs.tobytes())
+
+
+class PriceBook(Mapping):
+    """
+    A compiled price book, memory-mapped and readable as the `city_costs` mapping.
+
+    Only the names are parsed on load; each region's costs are decoded from the mapped
+    file when that region is read, so opening a book with thousands of regions takes
+    milliseconds and every process opening the same file shares its pages. Costs come
+    back as floats (ints in the source book become e.g. 282.0).
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._mapped)
+        if len(view) < _HEADER.size:
+            raise ValueError(f"{path} is not a compiled price book.")
+        magic, n_boxes, n_regions, names_len = _HEADER.unpack_from(view)
+        start = _HEADER.size + names_len
+        if magic != _MAGIC or len(view) != start + 8 * n_boxes * (1 + n_regions):
+            raise ValueError(f"{path} is not a compiled price book.")
+
+        names = json.loads(bytes(view[_HEADER.size:start]))
+        self._boxes: List[str] = names["boxes"]
+        self._regions: List[str] = names["regions"]
+        self._index = {region: k for k, region in enumerate(self._regions)}
+        volumes = view[start:start + 8 * n_boxes].cast("q")
+        self.box_sizes: List[Tuple[str, int]] = list(zip(self._boxes, volumes))
+        self._costs = view[start + 8 * n_boxes:].cast("d")
+
+    def __getitem__(self, region: str) -> Dict[str, Union[float, None]]:
+        first = self._index[region] * len(self._boxes)
+        row = self._costs[first:first + len(self._boxes)]
+        return {box: None if math.isnan(cost) else cost for box, cost in zip(self._boxes, row)}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._regions)
+
+    def __len__(self) -> int:
+        return len(self._regions)
+
+
+def load_compiled(path: str) -> Tuple[List[Tuple[str, int]], PriceBook]:
+    """
+    Open a compiled price book, returning its box catalog and the city_costs mapping.
+    """
+    book = PriceBook(path)
+    return book.box_sizes, book
+
+
+def load(path: str) -> Tuple[List[Tuple[str, int]], Mapping]:
+    """
+    Load a price book from a .json, .csv or compiled .pbk file, chosen by extension.
+    """
+    if path.endswith(".json"):
+        return load_json(path)
+    if path.endswith(".csv"):
+        return load_csv(path)
+    if path.endswith(".pbk"):
+        return load_compiled(path)
+    raise ValueError(f"Unsupported price book format: {path} (expected .json, .csv or .pbk).")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python pricebook.py <prices.json|prices.csv> <output.pbk>")
+        sys.exit(1)
+
+    # Compile a JSON or CSV price book into the memory-mappable binary format.
+    compile_pricebook(*load(sys.argv[1]), sys.argv[2])
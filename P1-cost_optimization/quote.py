@@ -0,0 +1,60 @@
+"""
+Minimal client for the quoting daemon started with `python daemon.py`.
+
+    python quote.py <time_input> <capacity_input> [--socket PATH]
+
+Prints the daemon's answer as one JSON line. Only `os`, `socket` and `sys` are imported,
+so a call costs little more than interpreter startup: the solving happens in the daemon,
+which keeps its tables warm between calls.
+"""
+
+import os
+import socket
+import sys
+
+
+def default_socket() -> str:
+    """
+    Socket shared by the daemon and this client: $MINIMIZE_COST_SOCKET if set, else in
+    $XDG_RUNTIME_DIR, else in a directory of /tmp private to the current user.
+    """
+    if os.environ.get("MINIMIZE_COST_SOCKET"):
+        return os.environ["MINIMIZE_COST_SOCKET"]
+    directory = os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/minimize_cost-{os.getuid()}"
+    return os.path.join(directory, "minimize_cost.sock")
+
+
+def quote(time: int, capacity: int, path: str) -> str:
+    """
+    Ask the daemon at `path` for one quote and return its JSON answer line.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(b'{"time": %d, "capacity": %d}\n' % (time, capacity))
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks).decode()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    path = default_socket()
+    if "--socket" in args:
+        position = args.index("--socket")
+        path = args[position + 1] if position + 1 < len(args) else ""
+        del args[position:position + 2]
+    if len(args) != 2 or not path or not all(arg.isdigit() for arg in args):
+        print("Usage: python quote.py <time_input> <capacity_input> [--socket PATH]", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        answer = quote(int(args[0]), int(args[1]), path)
+    except OSError as error:
+        print(f"Cannot reach the quoting daemon at {path}: {error}", file=sys.stderr)
+        sys.exit(1)
+    sys.stdout.write(answer)
@@ -0,0 +1,182 @@
+from functools import reduce
+from math import gcd
+from typing import Any, Dict, List, Tuple, Union
+
+from main import (_UNREACHABLE, _backtrack, _build_python, _filter_cities, _finish,
+                  _format_output, _to_minor)
+
+
+class IncrementalPricer:
+    """
+    Per-city DP tables kept up to date as individual prices change.
+
+    `minimize_cost` rebuilds every city's table on each call. This class keeps one table
+    per city, on the hourly rates and up to a fixed capacity, and answers quotes from
+    them. When a single price changes, only that city's table is touched, and only the
+    entries the changed box can affect:
+
+    - A price drop: the old table is still an upper bound everywhere, and any improved
+      fill is an old fill plus some of the cheaper boxes. One unbounded relaxation
+      pass of that box alone over the table makes it exact again.
+    - A price rise: an entry whose optimal fill does not use the box keeps its cost,
+      and every other fill only got dearer, so it stays optimal. The entries whose
+      fill uses the box are found in one forward pass over the picks and recomputed
+      in increasing order from their (already final) predecessors. If the box is in
+      no optimal fill, nothing is recomputed.
+
+    A box becoming available or unavailable can change the city's GCD grid, so it
+    rebuilds that city's table.
+    """
+
+    def __init__(self,
+                 box_sizes: List[Tuple[str, int]],
+                 city_costs: Dict[str, Dict[str, Union[float, None]]],
+                 capacity: int):
+        """
+        Parameters:
+            box_sizes (list of tuples): A list where each tuple consists of (box_name, box_volume).
+            city_costs (dict): Cost per hour of each box in each city; copied, then only
+                               changed through `set_price` and `update`.
+            capacity (int): Largest capacity the tables answer; a larger quote rebuilds them.
+        """
+        if capacity < 0:
+            raise ValueError("capacity must be a non-negative integer.")
+        self.box_sizes = list(box_sizes)
+        self.city_costs = {region: dict(costs) for region, costs in city_costs.items()}
+        self.capacity = capacity
+        self.rebuilds = 0  # Number of city tables built from scratch, for monitoring.
+        self.recomputed = 0  # Number of table entries recomputed or improved by price changes.
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        for region in self.city_costs:
+            self._build(region)
+
+    def _build(self, region: str) -> None:
+        """
+        Build a city's table from scratch on its own GCD grid.
+        """
+        (boxes, volumes, costs), = _filter_cities(self.box_sizes, {region: self.city_costs[region]}, 1)
+        step = reduce(gcd, volumes, 0)
+        volumes = [volume // step for volume in volumes] if step else []
+        dp, choice = _build_python(volumes, costs, self.capacity // step if step else 0)
+        self._tables[region] = {"boxes": boxes, "volumes": volumes, "costs": costs,
+                                "step": step, "dp": dp, "choice": choice}
+        self.rebuilds += 1
+
+    def _lower(self, table: Dict[str, Any], i: int) -> int:
+        """
+        Relax every entry with box `i` at its new, lower cost. Returns the entries improved.
+        """
+        dp, choice = table["dp"], table["choice"]
+        volume, cost = table["volumes"][i], table["costs"][i]
+        improved = 0
+        # Increasing order, so an entry improved in this pass can take the box again.
+        for j in range(len(dp) - volume):
+            new_cost = dp[j] + cost
+            if new_cost < dp[j + volume]:
+                dp[j + volume] = new_cost
+                choice[j + volume] = i
+                improved += 1
+        return improved
+
+    def _raise(self, table: Dict[str, Any], i: int) -> int:
+        """
+        Recompute the entries whose optimal fill uses box `i`. Returns how many there were.
+        """
+        dp, choice = table["dp"], table["choice"]
+        volumes, costs = table["volumes"], table["costs"]
+
+        # An entry uses the box if its last pick is the box or its predecessor uses it.
+        uses = bytearray(len(dp))
+        for j in range(1, len(dp)):
+            k = choice[j]
+            if k == i or (k >= 0 and uses[j - volumes[k]]):
+                uses[j] = 1
+
+        recomputed = 0
+        for j in range(1, len(dp)):
+            if not uses[j]:
+                continue
+            best, pick = _UNREACHABLE, -1
+            for k, volume in enumerate(volumes):
+                if volume <= j and dp[j - volume] + costs[k] < best:
+                    best, pick = dp[j - volume] + costs[k], k
+            dp[j], choice[j] = best, pick
+            recomputed += 1
+        return recomputed
+
+    def set_price(self, region: str, box: str, cost: Union[float, None]) -> int:
+        """
+        Change one hourly price (None withdraws the box) and repair that city's table.
+
+        Returns:
+            int: The number of table entries recomputed or improved (0 when the change
+                 cannot alter any quote; a full rebuild counts every entry).
+        """
+        if box not in dict(self.box_sizes):
+            raise KeyError(f"Unknown box {box!r}.")
+        if cost is not None and cost < 0:
+            raise ValueError("Costs must be non-negative.")
+        cost_table = self.city_costs.setdefault(region, {})
+        old = cost_table.get(box)
+        cost_table[box] = cost
+        if old == cost and region in self._tables:
+            return 0
+
+        table = self._tables.get(region)
+        if table is None or old is None or cost is None:
+            # The set of available boxes changed, and with it possibly the grid.
+            self._build(region)
+            changed = len(self._tables[region]["dp"])
+        else:
+            i = table["boxes"].index(box)
+            table["costs"][i] = _to_minor(cost)
+            changed = self._lower(table, i) if cost < old else self._raise(table, i)
+        self.recomputed += changed
+        return changed
+
+    def update(self, city_costs: Dict[str, Dict[str, Union[float, None]]]) -> Dict[str, int]:
+        """
+        Apply a new price table, repairing only the prices that differ from the current ones.
+
+        Returns:
+            dict: For each city with a changed price, the number of entries recomputed.
+        """
+        changes: Dict[str, int] = {}
+        for region, cost_table in city_costs.items():
+            if region not in self._tables:
+                # A new city: build its table once rather than box by box.
+                self.city_costs[region] = dict(cost_table)
+                self._build(region)
+                changes[region] = len(self._tables[region]["dp"])
+                self.recomputed += changes[region]
+                continue
+            current = self.city_costs[region]
+            for box, cost in cost_table.items():
+                if current.get(box) != cost:
+                    changes[region] = changes.get(region, 0) + self.set_price(region, box, cost)
+        return changes
+
+    def quote(self, time: int, capacity: int) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Answer a quote from the maintained tables, in the same format as `minimize_cost`.
+        """
+        if time < 0 or capacity < 0:
+            raise ValueError("Time and capacity must be non-negative integers.")
+        if capacity > self.capacity:
+            self.capacity = capacity
+            for region in self.city_costs:
+                self._build(region)
+
+        cities, solutions = [], []
+        for region in self.city_costs:
+            table = self._tables[region]
+            cities.append((table["boxes"], table["volumes"], table["costs"]))
+            step = table["step"]
+            if capacity == 0:
+                solutions.append((0, []))
+            elif step == 0 or capacity % step:
+                solutions.append((None, []))
+            else:
+                fill = _backtrack(table["dp"], table["choice"], table["volumes"], capacity // step)
+                solutions.append(_finish(fill, table["costs"], 0, 0))
+        return _format_output(self.city_costs, cities, solutions, time)
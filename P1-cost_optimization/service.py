@@ -0,0 +1,228 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+import pricebook
+from main import _from_minor, _to_minor, box_sizes, city_costs, minimize_cost, minimize_cost_batch
+from table_cache import TableCache
+
+
+# Per-process state of the solver workers, set up once by `_init_worker`.
+_worker_state: Dict[str, Any] = {}
+
+# Reason phrases for the status codes the service returns.
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error"}
+
+# Largest capacity quoted by default. The exact DP table grows with the capacity, so an
+# unbounded one would let a single request exhaust a worker's memory.
+DEFAULT_MAX_CAPACITY = 1_000_000
+
+
+def _init_worker(prices: Union[str, None]) -> None:
+    """
+    Load the price book and create the table cache of a worker process.
+    """
+    if prices is None:
+        _worker_state["box_sizes"], _worker_state["city_costs"] = box_sizes, city_costs
+    else:
+        _worker_state["box_sizes"], _worker_state["city_costs"] = pricebook.load(prices)
+    _worker_state["cache"] = TableCache(max_tables=max(128, len(_worker_state["city_costs"])))
+
+
+def _quote(time: int, capacity: int, top_k: Union[int, None]) -> Dict[str, Any]:
+    """
+    Solve one quote in a worker process, reusing the tables it has already built.
+    """
+    state = _worker_state
+    if top_k is None:
+        # Tables are built on hourly rates, so every time multiplier reuses them.
+        return minimize_cost_batch([(time, capacity)], state["box_sizes"], state["city_costs"],
+                                   cache=state["cache"])[0]
+    # Rank on hourly rates too, so the ranking shares those tables. `time` scales every
+    # cost alike, which leaves the order and the breakdowns unchanged.
+    result = minimize_cost(1, capacity, state["box_sizes"], state["city_costs"],
+                           cache=state["cache"], top_k=top_k)
+    for entry in result["Output"]:
+        if entry["total_cost"] != "No solution":
+            entry["total_cost"] = _from_minor(_to_minor(entry["total_cost"]) * time)
+    return result
+
+
+class QuoteService:
+    """
+    Asyncio quoting service around `minimize_cost`.
+
+    Solves run in a pool of worker processes, each holding the price book and a warm
+    `TableCache`, so the event loop only parses requests and writes responses.
+    Concurrent requests for the same quote share a single solve. The service can be
+    run on its own with `serve`, or mounted in any ASGI server or router through its
+    `asgi` method (for example under a path prefix in company_project/asgi.py).
+
+    Endpoints:
+        GET /quote?time=<int>&capacity=<int>[&top_k=<int>]  -> the minimize_cost result
+        GET /health                                          -> {"status": "ok"}
+    """
+
+    def __init__(self, prices: Union[str, None] = None, workers: int = 4,
+                 max_capacity: int = DEFAULT_MAX_CAPACITY):
+        """
+        Parameters:
+            prices (str): Optional price book (.json, .csv or .pbk); defaults to the
+                          tables in main.py.
+            workers (int): Number of solver processes.
+            max_capacity (int): Largest capacity a request may ask for; larger ones get a 400.
+        """
+        self.max_capacity = max_capacity
+        # Workers are spawned rather than forked: a fork from inside the event loop would
+        # inherit its open client sockets and keep those connections from closing.
+        self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(prices,),
+                                         mp_context=multiprocessing.get_context("spawn"))
+        self._inflight: Dict[Tuple, "asyncio.Future"] = {}
+        self.solves = 0  # Number of solves sent to the pool, for monitoring.
+
+    async def quote(self, time: int, capacity: int, top_k: Union[int, None] = None) -> Dict[str, Any]:
+        """
+        Quote a request, joining an identical solve already in flight if there is one.
+        """
+        key = (time, capacity, top_k)
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._pool, _quote, time, capacity, top_k)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            self.solves += 1
+        # Shield the shared solve so that one cancelled client does not cancel the others.
+        return await asyncio.shield(future)
+
+    async def respond(self, method: str, target: str) -> Tuple[int, Dict[str, Any]]:
+        """
+        Route a request and return (status code, JSON body).
+        """
+        url = urlsplit(target)
+        if method != "GET":
+            return 405, {"error": "Only GET is supported."}
+        if url.path == "/health":
+            return 200, {"status": "ok"}
+        if url.path != "/quote":
+            return 404, {"error": "Not found."}
+
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            time = int(query["time"])
+            capacity = int(query["capacity"])
+            top_k = int(query["top_k"]) if "top_k" in query else None
+        except (KeyError, ValueError):
+            return 400, {"error": "time and capacity must be integers (top_k optional)."}
+        if time < 0 or capacity < 0 or (top_k is not None and top_k < 1):
+            return 400, {"error": "time and capacity must be non-negative, top_k positive."}
+        if capacity > self.max_capacity:
+            return 400, {"error": f"capacity must be at most {self.max_capacity}."}
+        try:
+            return 200, await self.quote(time, capacity, top_k)
+        except Exception as error:
+            # A failed solve (e.g. a worker out of memory) still gets an answer.
+            return 500, {"error": f"Quote failed: {type(error).__name__}."}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve HTTP/1.1 requests on one connection until the client closes it.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = headers.get("content-length", "0")
+                if length.isdigit() and int(length):
+                    await reader.readexactly(int(length))
+
+                parts = request_line.decode("latin-1").split()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if not length.isdigit():
+                    # Without a valid length the body cannot be skipped, so close afterwards.
+                    status, body = 400, {"error": "Invalid Content-Length header."}
+                    keep_alive = False
+                elif len(parts) != 3:
+                    status, body = 400, {"error": "Malformed request line."}
+                else:
+                    status, body = await self.respond(parts[0], parts[1])
+
+                payload = json.dumps(body, separators=(",", ":")).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def asgi(self, scope: Dict[str, Any], receive, send) -> None:
+        """
+        ASGI entry point for HTTP requests.
+        """
+        if scope["type"] != "http":
+            return
+        target = scope["path"]
+        if scope.get("query_string"):
+            target += "?" + scope["query_string"].decode("latin-1")
+        status, body = await self.respond(scope["method"], target)
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": json.dumps(body).encode()})
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """
+        Start listening for HTTP requests and return the running server.
+        """
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self) -> None:
+        """
+        Shut down the worker processes.
+        """
+        self._pool.shutdown()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    service = QuoteService(args.prices, args.workers, args.max_capacity)
+    server = await service.serve(args.host, args.port)
+    print(f"Quoting on http://{args.host}:{args.port}/quote?time=1&capacity=1150")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTTP quoting service for minimize_cost.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--prices", metavar="FILE", help="Price book (.json, .csv or .pbk).")
+    parser.add_argument("--workers", type=int, default=4, help="Number of solver processes.")
+    parser.add_argument("--max-capacity", type=int, default=DEFAULT_MAX_CAPACITY,
+                        help=f"Largest capacity quoted (default: {DEFAULT_MAX_CAPACITY}).")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
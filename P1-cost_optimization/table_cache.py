@@ -0,0 +1,174 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from collections import OrderedDict
+from typing import Callable, List, Sequence, Tuple, Union
+
+
+# A DP table in compact form: (dp, picks) where dp[j] is the minimum cost to reach
+# exactly capacity j, in integer minor units, and picks[j] is the index of the last
+# box added (-1 if none).
+Table = Tuple[Sequence[int], Sequence[int]]
+
+# Header of an on-disk table: the number of entries as an unsigned 64-bit integer.
+_HEADER = struct.Struct("<Q")
+
+
+def _to_bytes(values: Sequence, typecode: str) -> bytes:
+    """
+    Raw machine representation of a list or NumPy array with the given array typecode.
+    """
+    if hasattr(values, "astype"):  # NumPy array
+        return values.astype(typecode).tobytes()
+    return array(typecode, values).tobytes()
+
+
+class TableCache:
+    """
+    Cache of per-city DP tables, in memory with LRU eviction and optionally on disk.
+
+    Tables are keyed on a hash of the box volumes and costs they were built from, so a
+    price or catalog change produces a new key and the stale table is simply never read
+    again: it ages out of memory, and out of the directory once more than `max_files`
+    tables are stored there. A table built up to capacity L answers every capacity up
+    to L; a request beyond L rebuilds and replaces it.
+
+    On disk, each table is one file holding the dp values as int64 followed by the
+    picks as int16. Files are memory-mapped on load, so a restarted worker reads only
+    the pages its backtracks touch and workers on the same host share those pages.
+    A file's modification time is refreshed when it is loaded, and the files used
+    least recently are deleted first.
+    """
+
+    def __init__(self, max_tables: int = 128, directory: Union[str, None] = None,
+                 max_files: int = 1024):
+        """
+        Parameters:
+            max_tables (int): Number of tables kept in memory before the least recently
+                              used one is evicted.
+            directory (str): Optional directory for memory-mapped table files.
+            max_files (int): Number of table files kept in `directory` before the least
+                             recently used ones are deleted.
+        """
+        if max_tables < 1 or max_files < 1:
+            raise ValueError("max_tables and max_files must be at least 1.")
+        self.max_tables = max_tables
+        self.max_files = max_files
+        self.directory = directory
+        self._tables: "OrderedDict[str, Table]" = OrderedDict()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    @staticmethod
+    def key(volumes: List[int], costs: List[int]) -> str:
+        """
+        Hash of the inputs a table is built from.
+        """
+        return hashlib.sha256(repr((tuple(volumes), tuple(costs))).encode()).hexdigest()
+
+    def get(self, key: str, capacity: int) -> Union[Table, None]:
+        """
+        Return the table for `key` if it covers `capacity`, from memory or disk.
+        """
+        table = self._tables.get(key)
+        if table is None and self.directory is not None:
+            table = self._load(key)
+            if table is not None:
+                self._remember(key, table)
+        if table is None or len(table[0]) <= capacity:
+            return None
+        self._tables.move_to_end(key)
+        return table
+
+    def put(self, key: str, dp: Sequence[int], picks: Sequence[int]) -> Table:
+        """
+        Store a table in memory and, if a directory is configured, on disk.
+        """
+        table = (dp, picks)
+        self._remember(key, table)
+        if self.directory is not None:
+            self._save(key, table)
+        return table
+
+    def fetch(self, volumes: List[int], costs: List[int], capacity: int,
+              build: Callable[[], Table]) -> Table:
+        """
+        Return the cached table for these boxes if it covers `capacity`, else build and store it.
+        """
+        key = self.key(volumes, costs)
+        table = self.get(key, capacity)
+        if table is None:
+            table = self.put(key, *build())
+        return table
+
+    def clear(self) -> None:
+        """
+        Drop every table from memory and delete the table files on disk.
+        """
+        self._tables.clear()
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".table"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _remember(self, key: str, table: Table) -> None:
+        self._tables[key] = table
+        self._tables.move_to_end(key)
+        while len(self._tables) > self.max_tables:
+            self._tables.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".table")
+
+    def _save(self, key: str, table: Table) -> None:
+        dp, picks = table
+        # Write to a temporary file first so concurrent readers never see a partial table.
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(len(dp)))
+            f.write(_to_bytes(dp, "q"))
+            f.write(_to_bytes(picks, "h"))
+        os.replace(tmp_path, self._path(key))
+        self._prune()
+
+    def _prune(self) -> None:
+        """
+        Delete the least recently used table files beyond `max_files`.
+        """
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".table"):
+                try:
+                    files.append((entry.stat().st_mtime_ns, entry.path))
+                except FileNotFoundError:
+                    pass  # Removed by another process meanwhile.
+        files.sort()
+        for _, path in files[:max(0, len(files) - self.max_files)]:
+            try:
+                # Processes that have the table mapped keep reading it until they drop it.
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _load(self, key: str) -> Union[Table, None]:
+        try:
+            with open(self._path(key), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(self._path(key))  # Mark as recently used for `_prune`.
+        except (FileNotFoundError, ValueError):
+            return None
+
+        view = memoryview(mapped)
+        start = _HEADER.size
+        size = _HEADER.unpack_from(view)[0] if len(view) >= start else -1
+        if len(view) != start + 10 * size:
+            return None  # Truncated or foreign file; rebuild instead of reading garbage.
+        dp = view[start:start + 8 * size].cast("q")
+        picks = view[start + 8 * size:start + 10 * size].cast("h")
+        return dp, picks
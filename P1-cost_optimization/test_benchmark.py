@@ -0,0 +1,57 @@
+"""
+Unit tests for the benchmark harness.
+
+Test cases include:
+- Measurements reporting time, throughput and peak memory for each combination.
+- Larger capacities being skipped once a series exceeds its time budget.
+- Regressions being detected only above the threshold.
+"""
+
+import unittest
+from benchmark import compare, make_regions, run
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_run_reports_every_combination(self):
+        """
+        Each (backend, regions, time, capacity) combination yields one measurement.
+        """
+        results = run([100, 1000], [2], [1, 3], ["python"], repeat=1)
+        self.assertEqual(len(results), 4)
+        for result in results:
+            self.assertEqual(result["regions"], 2)
+            self.assertGreater(result["seconds"], 0)
+            self.assertGreater(result["peak_memory_bytes"], 0)
+
+    def test_budget_skips_larger_capacities(self):
+        """
+        With a zero budget only the smallest capacity of each series is measured.
+        """
+        results = run([1000, 100], [1], [1], ["python"], budget=0.0, repeat=1)
+        self.assertEqual([r["capacity"] for r in results], [100, 1000])
+        self.assertNotIn("skipped", results[0])
+        self.assertTrue(results[1]["skipped"])
+
+    def test_make_regions_is_deterministic(self):
+        """
+        Synthetic regions keep unavailable boxes and are reproducible.
+        """
+        regions = make_regions(5)
+        self.assertEqual(regions, make_regions(5))
+        self.assertIsNone(regions["region-1"]["S"])
+
+    def test_compare_threshold(self):
+        """
+        Only measurements slower than the baseline by more than the threshold are reported.
+        """
+        def result(seconds):
+            return {"backend": "python", "capacity": 100, "regions": 3, "time": 1, "seconds": seconds}
+
+        self.assertEqual(compare([result(1.0)], [result(1.1)], threshold=0.2), [])
+        regressions = compare([result(1.0)], [result(1.5)], threshold=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0][1]["seconds"], 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
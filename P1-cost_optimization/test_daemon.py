@@ -0,0 +1,112 @@
+"""
+Unit tests for the Unix socket quoting daemon and its quote.py client.
+
+Test cases include:
+- The daemon answering quote.py clients and removing its socket on SIGTERM.
+- An idle connection not holding up other clients, and being closed after the timeout.
+- Oversize capacities answered with an error line.
+- Refusing to replace a file at the socket path that is not a socket.
+- The default socket path, outside any world-writable shared location.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+import daemon
+import quote
+from main import box_sizes, city_costs, minimize_cost
+
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "quotes.sock")
+
+    def start(self, *args):
+        """
+        Start a daemon on `self.path` and wait until it accepts connections.
+        """
+        process = subprocess.Popen([sys.executable, "daemon.py", "--socket", self.path, *args],
+                                   cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.addCleanup(process.wait, 10)
+        self.addCleanup(process.terminate)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            # The socket file appears at bind, just before the daemon starts listening.
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(self.path)
+                    break
+                except (FileNotFoundError, ConnectionRefusedError):
+                    time.sleep(0.01)
+        return process
+
+    def test_quotes(self):
+        """
+        The daemon answers quote.py clients and removes its socket on SIGTERM.
+        """
+        process = self.start("--warm", "2000")
+        for capacity in (1150, 160, 5):
+            expected = minimize_cost(2, capacity, box_sizes, city_costs)
+            self.assertEqual(json.loads(quote.quote(2, capacity, self.path)), expected)
+        process.terminate()
+        process.wait(10)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_idle_client(self):
+        """
+        A client holding an idle connection does not block other clients, and its
+        connection is closed once the timeout passes.
+        """
+        self.start("--timeout", "0.5")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as idle:
+            idle.connect(self.path)
+            expected = minimize_cost(1, 1150, box_sizes, city_costs)
+            self.assertEqual(json.loads(quote.quote(1, 1150, self.path)), expected)
+            idle.settimeout(5)
+            self.assertEqual(idle.recv(1), b"")
+
+    def test_rejects_oversize_capacity(self):
+        """
+        A capacity above --max-capacity gets an error line, and the daemon still
+        answers the next request.
+        """
+        self.start("--max-capacity", "2000")
+        self.assertIn("2000", json.loads(quote.quote(1, 10 ** 10, self.path))["error"])
+        expected = minimize_cost(1, 1150, box_sizes, city_costs)
+        self.assertEqual(json.loads(quote.quote(1, 1150, self.path)), expected)
+
+    def test_refuses_other_files(self):
+        """
+        A regular file at the socket path is left alone and the daemon does not start.
+        """
+        with open(self.path, "w") as f:
+            f.write("keep me")
+        with self.assertRaises(FileExistsError):
+            daemon.serve(self.path, box_sizes, city_costs)
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "keep me")
+
+    def test_default_socket(self):
+        """
+        The default socket is in $XDG_RUNTIME_DIR, else in a per-user directory.
+        """
+        with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": "/run/user/1000"}):
+            os.environ.pop("MINIMIZE_COST_SOCKET", None)
+            self.assertEqual(quote.default_socket(), "/run/user/1000/minimize_cost.sock")
+        with mock.patch.dict(os.environ):
+            os.environ.pop("MINIMIZE_COST_SOCKET", None)
+            os.environ.pop("XDG_RUNTIME_DIR", None)
+            self.assertEqual(os.path.dirname(quote.default_socket()),
+                             f"/tmp/minimize_cost-{os.getuid()}")
+
+
+if __name__ == '__main__':
+    unittest.main()
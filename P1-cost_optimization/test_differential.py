@@ -0,0 +1,49 @@
+"""
+Unit tests for the differential harness.
+
+Test cases include:
+- Every solver variant agreeing with the pure-Python reference on random requests.
+- Invalid breakdowns and wrong costs being caught by the checker.
+"""
+
+import random
+import unittest
+import differential
+from main import minimize_cost
+
+class TestDifferential(unittest.TestCase):
+
+    def test_variants_agree(self):
+        """
+        All variants give the reference costs and valid breakdowns, and each is timed.
+        """
+        seconds = differential.run(cases=150, seed=1)
+        self.assertEqual(list(seconds), list(differential.VARIANTS))
+        self.assertTrue(all(total > 0 for total in seconds.values()))
+
+    def test_check_rejects_bad_results(self):
+        """
+        A wrong cost, a breakdown that misses the capacity or uses an unoffered box fails.
+        """
+        box_sizes = [("L", 80), ("S", 20)]
+        city_costs = {"Delhi": {"L": 70, "S": None}}
+        case = (box_sizes, city_costs, 1, 160)
+        reference = minimize_cost(1, 160, box_sizes, city_costs)
+        differential.check(case, reference, reference)
+
+        for entry in ({"region": "Delhi", "total_cost": 139, "boxes": {"L": 2}},
+                      {"region": "Delhi", "total_cost": 140, "boxes": {"L": 1}},
+                      {"region": "Delhi", "total_cost": 140, "boxes": {"L": 1, "S": 4}}):
+            with self.assertRaises(AssertionError):
+                differential.check(case, {"Output": [entry]}, reference)
+
+    def test_random_case_is_reproducible(self):
+        """
+        The same seed generates the same requests.
+        """
+        self.assertEqual(differential.random_case(random.Random(7)),
+                         differential.random_case(random.Random(7)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 """
-Unit tests for the minimize_cost function.
+Unit tests for the minimize_cost and minimize_cost_batch functions.
 
 This module validates the behavior of the minimize_cost function
 
@@ -10,11 +10,31 @@ Test cases include:
 - Scenarios with only one box type available.
 - Scenarios where no boxes are available.
 - Scenarios where the capacity exactly matches the volume of a specific box.
+- Capacities that are not a multiple of the GCD of the box volumes.
+- The periodic fast path for large capacities agreeing with the full solve.
+- The NumPy backend agreeing with the pure-Python backend (skipped without NumPy).
+- Batch queries agreeing with individual calls.
+- Solving cities in worker processes.
+- Streaming JSONL requests, reusing every table with more than 128 regions.
+- Limited stock per city (bounded inventory).
+- Rejecting totals too large to solve exactly.
+- Covering mode (at least the capacity).
+- Ranking the k cheapest cities.
+- Backtracking without stored picks.
+- Profiling stats returned alongside the output.
+- Rate schedules with time-varying hourly rates.
+- The checkpointed low-memory mode.
+- Exact costs in integer minor units across engines.
 - Negative input values for capacity and time, which should raise a ValueError.
 """
 
+import io
+import json
 import unittest
-from main import minimize_cost
+from unittest import mock
+
+import main
+from main import _numpy, minimize_cost, minimize_cost_batch, stream_quotes
 
 class TestMinimizeCostCalculation(unittest.TestCase):
 
@@ -140,6 +160,366 @@ class TestMinimizeCostCalculation(unittest.TestCase):
         result = minimize_cost(self.time_input, capacity_input, self.box_sizes, self.city_costs)
         self.assertEqual(result, expected)
 
+    def test_capacity_not_multiple_of_gcd(self):
+        """
+        All volumes are multiples of 10, so a capacity such as 1155 is rejected
+        immediately with "No solution" for every city.
+        """
+        result = minimize_cost(self.time_input, 1155, self.box_sizes, self.city_costs)
+        for entry in result["Output"]:
+            self.assertEqual(entry["total_cost"], "No solution")
+            self.assertEqual(entry["boxes"], {})
+
+    def test_gcd_scaled_catalog(self):
+        """
+        Volumes sharing a common factor other than 10 (here 30) are solved on the
+        scaled grid and still produce an exact fill.
+        """
+        box_sizes = [("B", 90), ("A", 60)]
+        city_costs = {"TestCity": {"A": 5, "B": 8}}
+        expected = {
+            "Output": [
+                {"region": "TestCity", "total_cost": 13, "boxes": {"A": 1, "B": 1}}
+            ]
+        }
+        result = minimize_cost(self.time_input, 150, box_sizes, city_costs)
+        self.assertEqual(result, expected)
+        result = minimize_cost(self.time_input, 100, box_sizes, city_costs)
+        self.assertEqual(result["Output"][0]["total_cost"], "No solution")
+
+    def test_periodic_matches_full_solve(self):
+        """
+        The periodic fast path must return the same total cost as the full DP,
+        with a box breakdown that fills the capacity exactly at that cost.
+        """
+        volumes = dict(self.box_sizes)
+        for capacity in (0, 1150, 5000, 12340, 50010):
+            full = minimize_cost(2, capacity, self.box_sizes, self.city_costs)
+            fast = minimize_cost(2, capacity, self.box_sizes, self.city_costs, periodic=True)
+            for expected, entry in zip(full["Output"], fast["Output"]):
+                self.assertEqual(entry["region"], expected["region"])
+                self.assertAlmostEqual(entry["total_cost"], expected["total_cost"], places=6)
+                costs = self.city_costs[entry["region"]]
+                self.assertEqual(sum(volumes[b] * n for b, n in entry["boxes"].items()), capacity)
+                self.assertAlmostEqual(sum(costs[b] * 2 * n for b, n in entry["boxes"].items()),
+                                       entry["total_cost"], places=6)
+
+    def test_periodic_huge_capacity(self):
+        """
+        A capacity of 10^9 is answered without building a table of that size.
+        """
+        result = minimize_cost(self.time_input, 10**9, self.box_sizes, self.city_costs, periodic=True)
+        delhi = result["Output"][0]
+        self.assertEqual(delhi["boxes"], {"XL": 10**9 // 160})
+        self.assertEqual(delhi["total_cost"], 140 * (10**9 // 160))
+
+    @unittest.skipUnless(_numpy(), "NumPy is not installed")
+    def test_numpy_backend_matches_python(self):
+        """
+        The vectorized backend must agree with the pure-Python DP on cost and produce
+        a valid breakdown, including unreachable and zero capacities.
+        """
+        volumes = dict(self.box_sizes)
+        for capacity in (0, 5, 160, 1150, 12340):
+            expected = minimize_cost(self.time_input, capacity, self.box_sizes, self.city_costs)
+            result = minimize_cost(self.time_input, capacity, self.box_sizes, self.city_costs,
+                                   backend="numpy")
+            for want, entry in zip(expected["Output"], result["Output"]):
+                if want["total_cost"] == "No solution":
+                    self.assertEqual(entry, want)
+                    continue
+                self.assertAlmostEqual(entry["total_cost"], want["total_cost"], places=6)
+                self.assertEqual(sum(volumes[b] * n for b, n in entry["boxes"].items()), capacity)
+
+    @unittest.skipUnless(_numpy(), "NumPy is not installed")
+    def test_numpy_shared_pass_mixed_catalogs(self):
+        """
+        Cities with different box subsets (and so different GCDs) solved in one shared
+        pass must match the per-city pure-Python solve.
+        """
+        box_sizes = [("C", 30), ("B", 20), ("A", 10)]
+        city_costs = {
+            "Thirties": {"A": None, "B": None, "C": 7},
+            "Twenties": {"A": None, "B": 5, "C": None},
+            "All": {"A": 3, "B": 5, "C": 7},
+        }
+        for capacity in (0, 50, 60, 90, 170):
+            expected = minimize_cost(self.time_input, capacity, box_sizes, city_costs)
+            result = minimize_cost(self.time_input, capacity, box_sizes, city_costs, backend="numpy")
+            self.assertEqual(result, expected)
+
+    def test_workers_match_serial(self):
+        """
+        Solving the cities in worker processes gives the same costs and breakdowns.
+        """
+        expected = minimize_cost(self.time_input, self.capacity_input, self.box_sizes, self.city_costs)
+        result = minimize_cost(self.time_input, self.capacity_input, self.box_sizes, self.city_costs,
+                               workers=2)
+        self.assertEqual(result, expected)
+        with self.assertRaises(ValueError):
+            minimize_cost(self.time_input, self.capacity_input, self.box_sizes, self.city_costs,
+                          workers=0)
+
+    def test_unknown_backend(self):
+        """
+        An unsupported backend name is rejected with a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            minimize_cost(self.time_input, 160, self.box_sizes, self.city_costs, backend="gpu")
+
+    def test_batch_matches_single_queries(self):
+        """
+        Every query answered from the shared batch table must match an individual
+        minimize_cost call with the same time and capacity.
+        """
+        queries = [(1, 1150), (2, 1150), (3, 160), (1, 0), (1, 5), (5, 2470)]
+        results = minimize_cost_batch(queries, self.box_sizes, self.city_costs)
+        self.assertEqual(len(results), len(queries))
+        for (time_input, capacity), result in zip(queries, results):
+            expected = minimize_cost(time_input, capacity, self.box_sizes, self.city_costs)
+            for want, entry in zip(expected["Output"], result["Output"]):
+                self.assertEqual(entry["region"], want["region"])
+                self.assertEqual(entry["boxes"], want["boxes"])
+                if want["total_cost"] == "No solution":
+                    self.assertEqual(entry["total_cost"], "No solution")
+                else:
+                    self.assertAlmostEqual(entry["total_cost"], want["total_cost"], places=6)
+
+    def test_batch_negative_query(self):
+        """
+        A single invalid query rejects the whole batch with a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            minimize_cost_batch([(1, 160), (-1, 160)], self.box_sizes, self.city_costs)
+
+    def test_stream_quotes(self):
+        """
+        Streamed JSONL requests produce one compact result line each, in order,
+        echoing ids and reporting malformed lines without stopping.
+        """
+        lines = [
+            '{"time": 1, "capacity": 1150, "id": 7}\n',
+            '\n',
+            'not json\n',
+            '{"time": 2, "capacity": 160}\n',
+            '{"time": -1, "capacity": 160}\n',
+        ]
+        output = io.StringIO()
+        written = stream_quotes(lines, output, self.box_sizes, self.city_costs, chunk_size=2)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(written, 4)
+        self.assertEqual(len(results), 4)
+        expected = minimize_cost(1, 1150, self.box_sizes, self.city_costs)
+        self.assertEqual(results[0], {"id": 7, **expected})
+        self.assertIn("error", results[1])
+        self.assertEqual(results[2], minimize_cost(2, 160, self.box_sizes, self.city_costs))
+        self.assertIn("error", results[3])
+        self.assertNotIn(" ", output.getvalue().splitlines()[0])
+
+    def test_stream_quotes_many_regions(self):
+        """
+        With more regions than the default 128 tables, later chunks still reuse every
+        table instead of rebuilding each region's table per chunk.
+        """
+        city_costs = {f"Region {i}": {"XS": 12 + i, "S": 23 + i} for i in range(200)}
+        box_sizes = [("S", 20), ("XS", 10)]
+        lines = ['{"time": 1, "capacity": 100}\n'] * 3
+        with mock.patch("main._build_python", wraps=main._build_python) as build:
+            written = stream_quotes(lines, io.StringIO(), box_sizes, city_costs, chunk_size=1)
+        self.assertEqual(written, 3)
+        self.assertEqual(build.call_count, 200)
+
+    def test_stock_limits(self):
+        """
+        With only 3 XL boxes in Delhi, the rest of 1150 must come from smaller boxes,
+        and the limit is never exceeded. Cities without limits are unchanged.
+        """
+        stock = {"Delhi": {"XL": 3}}
+        expected = minimize_cost(self.time_input, self.capacity_input, self.box_sizes, self.city_costs)
+        for backend in ("python", "numpy") if _numpy() else ("python",):
+            result = minimize_cost(self.time_input, self.capacity_input, self.box_sizes,
+                                   self.city_costs, backend=backend, stock=stock)
+            delhi = result["Output"][0]
+            self.assertEqual(delhi["boxes"]["XL"], 3)
+            self.assertEqual(delhi["boxes"], {"XXL": 2, "XL": 3, "S": 1, "XS": 1})
+            self.assertAlmostEqual(delhi["total_cost"], 2 * 282 + 3 * 140 + 23 + 12)
+            self.assertEqual(result["Output"][1:], expected["Output"][1:])
+
+    def test_totals_out_of_range(self):
+        """
+        Quotes whose totals could reach the unreachable sentinel raise instead of
+        reporting "No solution" (or overflowing the int64 NumPy tables).
+        """
+        for backend in ("python", "numpy") if _numpy() else ("python",):
+            for time in (10 ** 14, 10 ** 15):
+                with self.assertRaises(ValueError):
+                    minimize_cost(time, 1150, self.box_sizes, self.city_costs, backend=backend)
+        with self.assertRaises(ValueError):
+            minimize_cost_batch([(1, 10 ** 17)], self.box_sizes, self.city_costs)
+        result = minimize_cost(10 ** 12, 1150, self.box_sizes, self.city_costs)
+        self.assertEqual(result["Output"][0]["total_cost"], 1015 * 10 ** 12)
+
+    def test_stock_exhausted(self):
+        """
+        When the stock cannot fill the capacity exactly, the city has no solution. Negative
+        or fractional counts, limits for unknown regions and periodic mode are rejected.
+        """
+        stock = {"TestCity": {"L": 1}}
+        city_costs = {"TestCity": {"L": 50}}
+        result = minimize_cost(self.time_input, 160, self.box_sizes, city_costs, stock=stock)
+        self.assertEqual(result["Output"][0]["total_cost"], "No solution")
+        with self.assertRaises(ValueError):
+            minimize_cost(self.time_input, 160, self.box_sizes, city_costs, stock={"TestCity": {"L": -1}})
+        with self.assertRaises(ValueError):
+            minimize_cost(self.time_input, 160, self.box_sizes, city_costs, stock=stock, periodic=True)
+        with self.assertRaises(ValueError):
+            minimize_cost(self.time_input, 160, self.box_sizes, city_costs, stock={"TestCity": {"L": 2.5}})
+        with self.assertRaises(ValueError):
+            minimize_cost(self.time_input, 160, self.box_sizes, city_costs, stock={"Testcity": {"L": 1}})
+
+    def test_at_least_capacity(self):
+        """
+        In covering mode an unreachable capacity is rounded up to the cheapest fill
+        above it, and an XL box can beat an exact fill of 150.
+        """
+        for backend in ("python", "numpy") if _numpy() else ("python",):
+            result = minimize_cost(self.time_input, 5, self.box_sizes, self.city_costs,
+                                   backend=backend, at_least=True)
+            self.assertEqual([entry["boxes"] for entry in result["Output"]],
+                             [{"XS": 1}, {"XS": 1}, {"XS": 1}])
+
+            result = minimize_cost(self.time_input, 150, self.box_sizes, self.city_costs,
+                                   backend=backend, at_least=True)
+            self.assertEqual(result["Output"][1], {"region": "Mumbai", "total_cost": 130, "boxes": {"XL": 1}})
+
+        city_costs = {"EmptyCity": {"XXL": None, "XL": None, "L": None, "M": None, "S": None, "XS": None}}
+        result = minimize_cost(self.time_input, 100, self.box_sizes, city_costs, at_least=True)
+        self.assertEqual(result["Output"][0]["total_cost"], "No solution")
+        with self.assertRaises(ValueError):
+            minimize_cost(self.time_input, 100, self.box_sizes, self.city_costs, at_least=True, periodic=True)
+
+    def test_top_k_ranking(self):
+        """
+        top_k returns only the cheapest cities, cheapest first, and leaves out cities
+        with no solution.
+        """
+        result = minimize_cost(self.time_input, self.capacity_input, self.box_sizes, self.city_costs,
+                               top_k=2)
+        self.assertEqual(result, {
+            "Output": [
+                {"region": "Kolkata", "total_cost": 857, "boxes": {"XL": 7, "S": 1, "XS": 1}},
+                {"region": "Mumbai", "total_cost": 952, "boxes": {"XL": 7, "XS": 3}},
+            ]
+        })
+        result = minimize_cost(self.time_input, 5, self.box_sizes, self.city_costs, top_k=2)
+        self.assertEqual(result, {"Output": []})
+        with self.assertRaises(ValueError):
+            minimize_cost(self.time_input, 5, self.box_sizes, self.city_costs, top_k=0)
+
+    def test_without_stored_picks(self):
+        """
+        Test that backtracking from the costs alone gives the same costs and valid fills.
+        """
+        volumes = dict(self.box_sizes)
+        for capacity in (0, 10, 150, 1150, 4570):
+            expected = minimize_cost(2, capacity, self.box_sizes, self.city_costs)
+            result = minimize_cost(2, capacity, self.box_sizes, self.city_costs, store_picks=False)
+            for entry, expected_entry in zip(result["Output"], expected["Output"]):
+                self.assertEqual(entry["total_cost"], expected_entry["total_cost"])
+                if entry["total_cost"] != "No solution":
+                    self.assertEqual(sum(volumes[box] * count for box, count in entry["boxes"].items()),
+                                     capacity)
+
+    def test_stats(self):
+        """
+        Test that stats are only returned on request and describe each city's solve.
+        """
+        plain = minimize_cost(1, 1150, self.box_sizes, self.city_costs)
+        self.assertNotIn("Stats", plain)
+
+        result = minimize_cost(1, 1150, self.box_sizes, self.city_costs, stats=True)
+        self.assertEqual(result["Output"], plain["Output"])
+        stats = result["Stats"]
+        self.assertEqual([record["region"] for record in stats["cities"]], ["Delhi", "Mumbai", "Kolkata"])
+        delhi = stats["cities"][0]
+        self.assertEqual(delhi["table_size"], 116)  # 1150 / 10 + 1 entries on the GCD grid.
+        self.assertEqual(delhi["relaxations"], 116 * 6)
+        self.assertEqual(delhi["backtrack_length"], 9)  # 7 XL, 1 S and 1 XS.
+        self.assertGreater(stats["peak_memory_bytes"], 0)
+        self.assertGreaterEqual(stats["seconds"], sum(record["seconds"] for record in stats["cities"]))
+
+        # Only the cities ranking actually solves are profiled.
+        ranked = minimize_cost(1, 1150, self.box_sizes, self.city_costs, top_k=1, stats=True)
+        self.assertEqual([record["region"] for record in ranked["Stats"]["cities"]], ["Kolkata"])
+
+    def test_rate_schedule(self):
+        """
+        Test that a rate schedule costs each box by the hours spent in each window.
+        """
+        peak = {box: None if cost is None else cost * 2 for box, cost in self.city_costs["Delhi"].items()}
+        schedule = {"Delhi": [(8, peak), (16, self.city_costs["Delhi"])]}
+
+        # Three days: 24 peak hours and 48 off-peak hours, i.e. 96 hours at the flat rate.
+        result = minimize_cost(72, 1150, self.box_sizes, self.city_costs, schedule=schedule)
+        expected = minimize_cost(96, 1150, self.box_sizes, self.city_costs)
+        self.assertEqual(result["Output"][0], expected["Output"][0])
+        self.assertEqual(result["Output"][1:], minimize_cost(72, 1150, self.box_sizes, self.city_costs)["Output"][1:])
+
+        # Starting at hour 20, 10 hours spend 4 off-peak and then 6 peak.
+        result = minimize_cost(10, 160, self.box_sizes, self.city_costs, schedule=schedule, start=20)
+        self.assertEqual(result["Output"][0]["total_cost"], 140 * 4 + 280 * 6)
+
+        # Rates can change the best fill: XL boxes are dear at peak, and unavailable
+        # boxes in a window the quote crosses cannot be used at all.
+        windows = [(1, {"XS": 10, "L": 60, "XL": 1000}), (1, {"XS": 10, "L": 60, "XL": 100, "S": 1})]
+        result = minimize_cost(2, 160, self.box_sizes, {"Delhi": self.city_costs["Delhi"]},
+                               schedule={"Delhi": windows})
+        self.assertEqual(result["Output"][0], {"region": "Delhi", "total_cost": 240, "boxes": {"L": 2}})
+
+        with self.assertRaises(ValueError):
+            minimize_cost(1, 10, self.box_sizes, self.city_costs, schedule={"Pune": [(1, {})]})
+        with self.assertRaises(ValueError):
+            minimize_cost(1, 10, self.box_sizes, self.city_costs, schedule={"Delhi": [(0, {})]})
+
+    def test_low_memory(self):
+        """
+        Test that the checkpointed low-memory solve agrees with the full tables.
+        """
+        for capacity in (0, 5, 10, 1150, 25000):
+            for periodic in (False, True):
+                expected = minimize_cost(3, capacity, self.box_sizes, self.city_costs, periodic=periodic)
+                result = minimize_cost(3, capacity, self.box_sizes, self.city_costs,
+                                       periodic=periodic, low_memory=True)
+                self.assertEqual(result, expected)
+        with self.assertRaises(ValueError):
+            minimize_cost(1, 10, self.box_sizes, self.city_costs, low_memory=True, at_least=True)
+
+    def test_costs_in_minor_units(self):
+        """
+        Test that fractional rates give exact, identical totals on every engine.
+        """
+        city_costs = {"Mumbai": {"M": 41.3, "L": 89, "XS": 0.1}}
+        results = [minimize_cost(3, 40, self.box_sizes, city_costs),
+                   minimize_cost(3, 40, self.box_sizes, city_costs, workers=2),
+                   minimize_cost(3, 40, self.box_sizes, city_costs, low_memory=True)]
+        if _numpy() is not None:
+            results.append(minimize_cost(3, 40, self.box_sizes, city_costs, backend="numpy"))
+        for result in results:
+            # Four XS boxes at 0.1 for 3 hours: 1.2, not 1.2000000000000002.
+            self.assertEqual(result["Output"][0]["total_cost"], 1.2)
+            self.assertEqual(result, results[0])
+
+        # Whole totals come back as ints, whichever engine computed them.
+        result = minimize_cost(10, 40, self.box_sizes, city_costs, workers=2)
+        self.assertEqual(result["Output"][0]["total_cost"], 4)
+        self.assertIs(type(result["Output"][0]["total_cost"]), int)
+
+        # Rates finer than a paisa are rounded before the time multiplier on every path.
+        fine = {"Delhi": {"XS": 0.007}}
+        single = minimize_cost(3, 10, [("XS", 10)], fine)
+        self.assertEqual(single, minimize_cost_batch([(3, 10)], [("XS", 10)], fine)[0])
+        self.assertEqual(single["Output"][0]["total_cost"], 0.03)
+
     def test_negative_capacity(self):
         """
         Negative capacity values are invalid.
@@ -148,7 +528,6 @@ class TestMinimizeCostCalculation(unittest.TestCase):
         with self.assertRaises(ValueError):
             minimize_cost(self.time_input, -10, self.box_sizes, self.city_costs)
 
-  
 
 if __name__ == '__main__':
     unittest.main()
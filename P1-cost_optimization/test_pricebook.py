@@ -0,0 +1,109 @@
+"""
+Unit tests for loading and compiling price books.
+
+Test cases include:
+- Loading the catalog and prices from JSON and CSV.
+- Compiling a price book and reading it back through the memory-mapped PriceBook.
+- minimize_cost giving the same costs with a compiled book as with the dicts.
+- Rejecting unsupported extensions and files that are not compiled price books.
+- Rejecting non-positive volumes and negative or non-finite costs on load and compile.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+import pricebook
+from main import minimize_cost
+
+class TestPriceBook(unittest.TestCase):
+
+    def setUp(self):
+        # Define available box sizes in the required order.
+        self.box_sizes = [("XXL", 320), ("XL", 160), ("L", 80), ("M", 40), ("S", 20), ("XS", 10)]
+
+        # Define cost of each box per hour in different cities.
+        self.city_costs = {
+            "Delhi": {"XS": 12, "S": 23, "M": 45, "L": 77.4, "XL": 140, "XXL": 282},
+            "Mumbai": {"XS": 14, "S": None, "M": 41.3, "L": 89, "XL": 130, "XXL": 297},
+            "Kolkata": {"XS": 11, "S": 20, "M": None, "L": 67, "XL": 118, "XXL": None},
+        }
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_load_json(self):
+        """
+        A JSON price book loads into the same shape as the globals in main.py.
+        """
+        with open(self.path("prices.json"), "w") as f:
+            json.dump({"box_sizes": self.box_sizes, "city_costs": self.city_costs}, f)
+        box_sizes, city_costs = pricebook.load(self.path("prices.json"))
+        self.assertEqual(box_sizes, self.box_sizes)
+        self.assertEqual(city_costs, self.city_costs)
+
+    def test_load_csv(self):
+        """
+        A long-format CSV loads with boxes ordered by descending volume and empty
+        costs read as None.
+        """
+        with open(self.path("prices.csv"), "w") as f:
+            f.write("region,box,volume,cost\n")
+            for region, cost_table in self.city_costs.items():
+                for box, volume in reversed(self.box_sizes):
+                    cost = cost_table[box]
+                    f.write(f"{region},{box},{volume},{'' if cost is None else cost}\n")
+        box_sizes, city_costs = pricebook.load(self.path("prices.csv"))
+        self.assertEqual(box_sizes, self.box_sizes)
+        self.assertEqual(city_costs, self.city_costs)
+
+    def test_compiled_round_trip(self):
+        """
+        A compiled book reads back the same catalog and prices, and solves identically.
+        """
+        pricebook.compile_pricebook(self.box_sizes, self.city_costs, self.path("prices.pbk"))
+        box_sizes, city_costs = pricebook.load(self.path("prices.pbk"))
+        self.assertEqual(box_sizes, self.box_sizes)
+        self.assertEqual(list(city_costs), list(self.city_costs))
+        self.assertEqual(dict(city_costs), self.city_costs)
+
+        expected = minimize_cost(2, 1150, self.box_sizes, self.city_costs)
+        result = minimize_cost(2, 1150, box_sizes, city_costs)
+        self.assertEqual(result, expected)
+
+    def test_rejects_unknown_files(self):
+        """
+        Unsupported extensions and files without the compiled header raise ValueError.
+        """
+        with self.assertRaises(ValueError):
+            pricebook.load(self.path("prices.xml"))
+        with open(self.path("bogus.pbk"), "wb") as f:
+            f.write(b"not a price book")
+        with self.assertRaises(ValueError):
+            pricebook.load(self.path("bogus.pbk"))
+
+    def test_rejects_invalid_prices(self):
+        """
+        Zero volumes and negative or NaN costs raise ValueError when loaded or compiled.
+        """
+        with open(self.path("zero.json"), "w") as f:
+            json.dump({"box_sizes": [["XS", 10], ["Z", 0]], "city_costs": {"Delhi": {"XS": 1}}}, f)
+        with self.assertRaises(ValueError):
+            pricebook.load(self.path("zero.json"))
+
+        for cost in ("-5", "nan", "inf"):
+            with open(self.path("bad.csv"), "w") as f:
+                f.write(f"region,box,volume,cost\nDelhi,XS,10,{cost}\n")
+            with self.assertRaises(ValueError):
+                pricebook.load(self.path("bad.csv"))
+
+        with self.assertRaises(ValueError):
+            pricebook.compile_pricebook(self.box_sizes, {"Delhi": {"XS": float("nan")}},
+                                        self.path("bad.pbk"))
+
+
+if __name__ == '__main__':
+    unittest.main()
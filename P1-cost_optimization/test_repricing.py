@@ -0,0 +1,97 @@
+"""
+Unit tests for the IncrementalPricer class.
+
+Test cases include:
+- Quotes matching minimize_cost before and after price changes.
+- A price rise on a box no optimal fill uses recomputing nothing.
+- A price change touching only the table of its own city.
+- Withdrawing and re-offering a box rebuilding only that city.
+- Applying a whole new price table through update.
+"""
+
+import unittest
+from main import minimize_cost
+from repricing import IncrementalPricer
+
+class TestIncrementalPricer(unittest.TestCase):
+
+    def setUp(self):
+        # Define available box sizes in the required order.
+        self.box_sizes = [("XXL", 320), ("XL", 160), ("L", 80), ("M", 40), ("S", 20), ("XS", 10)]
+
+        # Define cost of each box per hour in different cities.
+        self.city_costs = {
+            "Delhi": {"XS": 12, "S": 23, "M": 45, "L": 77.4, "XL": 140, "XXL": 282},
+            "Mumbai": {"XS": 14, "S": None, "M": 41.3, "L": 89, "XL": 130, "XXL": 297},
+            "Kolkata": {"XS": 11, "S": 20, "M": None, "L": 67, "XL": 118, "XXL": None},
+        }
+        self.pricer = IncrementalPricer(self.box_sizes, self.city_costs, 1150)
+
+    def assertQuotesMatch(self, time, capacity):
+        expected = minimize_cost(time, capacity, self.box_sizes, self.city_costs)
+        result = self.pricer.quote(time, capacity)
+        for entry, expected_entry in zip(result["Output"], expected["Output"]):
+            self.assertEqual(entry["region"], expected_entry["region"])
+            self.assertAlmostEqual(entry["total_cost"], expected_entry["total_cost"])
+
+    def test_matches_minimize_cost(self):
+        """
+        Quotes agree with minimize_cost after drops and rises of a used box.
+        """
+        self.assertEqual(self.pricer.quote(1, 1150), minimize_cost(1, 1150, self.box_sizes, self.city_costs))
+        for box, cost in (("L", 60), ("XL", 200), ("XS", 5), ("L", 90)):
+            self.pricer.set_price("Delhi", box, cost)
+            self.city_costs["Delhi"][box] = cost
+            for capacity in (0, 10, 150, 1150):
+                self.assertQuotesMatch(2, capacity)
+
+    def test_unused_box_rise_recomputes_nothing(self):
+        """
+        XXL is in no optimal Delhi fill, so making it dearer leaves the table alone.
+        """
+        self.assertEqual(self.pricer.set_price("Delhi", "XXL", 400), 0)
+        self.assertEqual(self.pricer.set_price("Delhi", "XXL", 400), 0)
+        self.city_costs["Delhi"]["XXL"] = 400
+        self.assertQuotesMatch(1, 1150)
+
+    def test_only_the_changed_city_is_touched(self):
+        """
+        A price drop improves entries of that city's table only.
+        """
+        tables = {region: list(table["dp"]) for region, table in self.pricer._tables.items()}
+        self.assertGreater(self.pricer.set_price("Mumbai", "M", 20), 0)
+        self.assertEqual(list(self.pricer._tables["Delhi"]["dp"]), tables["Delhi"])
+        self.assertEqual(list(self.pricer._tables["Kolkata"]["dp"]), tables["Kolkata"])
+        self.assertNotEqual(list(self.pricer._tables["Mumbai"]["dp"]), tables["Mumbai"])
+        self.assertEqual(self.pricer.rebuilds, 3)
+
+    def test_availability_change_rebuilds_city(self):
+        """
+        Withdrawing or re-offering a box rebuilds that city's table and nothing else.
+        """
+        self.pricer.set_price("Kolkata", "XS", None)
+        self.city_costs["Kolkata"]["XS"] = None
+        self.assertQuotesMatch(1, 1150)
+        self.assertQuotesMatch(1, 1160)
+        self.pricer.set_price("Kolkata", "M", 30)
+        self.city_costs["Kolkata"]["M"] = 30
+        self.assertQuotesMatch(1, 1160)
+        self.assertEqual(self.pricer.rebuilds, 3 + 2 + 3)  # The 1160 quote grows every table.
+        with self.assertRaises(KeyError):
+            self.pricer.set_price("Delhi", "XXXL", 1)
+
+    def test_update(self):
+        """
+        update applies only the differing prices and adds new cities.
+        """
+        new_costs = {region: dict(costs) for region, costs in self.city_costs.items()}
+        new_costs["Delhi"]["L"] = 50
+        new_costs["Chennai"] = {"XS": 9, "XL": 150}
+        changes = self.pricer.update(new_costs)
+        self.assertEqual(set(changes), {"Delhi", "Chennai"})
+        self.city_costs = new_costs
+        self.assertQuotesMatch(3, 1150)
+
+
+if __name__ == '__main__':
+    unittest.main()
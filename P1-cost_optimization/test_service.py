@@ -0,0 +1,135 @@
+"""
+Unit tests for the asyncio quoting service.
+
+Test cases include:
+- Quotes over HTTP matching minimize_cost.
+- Ranked quotes reusing the tables built on hourly rates.
+- Concurrent identical requests sharing a single solve.
+- Invalid parameters, unknown paths and methods being rejected.
+- Oversize capacities and bad headers getting a 400, and failed solves a 500.
+- The ASGI entry point.
+"""
+
+import asyncio
+import json
+import unittest
+from main import box_sizes, city_costs, minimize_cost
+import service
+from service import QuoteService
+
+async def fetch(port, target, method="GET", headers=""):
+    """
+    Send one HTTP request and return (status code, decoded JSON body).
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: test\r\n{headers}Connection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+class TestQuoteService(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.service = QuoteService(workers=2)
+        self.server = await self.service.serve(port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.service.close()
+
+    async def test_quote(self):
+        """
+        A quote over HTTP returns the same result as minimize_cost.
+        """
+        status, body = await fetch(self.port, "/quote?time=2&capacity=1150")
+        self.assertEqual(status, 200)
+        self.assertEqual(body, minimize_cost(2, 1150, box_sizes, city_costs))
+
+        status, body = await fetch(self.port, "/quote?time=1&capacity=1150&top_k=1")
+        self.assertEqual(body["Output"], [{"region": "Kolkata", "total_cost": 857,
+                                           "boxes": {"XL": 7, "S": 1, "XS": 1}}])
+
+        status, body = await fetch(self.port, "/quote?time=3&capacity=1150&top_k=2")
+        self.assertEqual(body, minimize_cost(3, 1150, box_sizes, city_costs, top_k=2))
+
+    async def test_ranking_reuses_hourly_tables(self):
+        """
+        A ranked quote for any time reads the tables an unranked quote built.
+        """
+        service._init_worker(None)
+        try:
+            service._quote(1, 1150, None)
+            built = dict(service._worker_state["cache"]._tables)
+            service._quote(3, 1150, 2)
+            self.assertEqual(service._worker_state["cache"]._tables, built)
+        finally:
+            service._worker_state.clear()
+
+    async def test_identical_requests_share_a_solve(self):
+        """
+        Concurrent identical quotes are answered by one solve.
+        """
+        responses = await asyncio.gather(*[fetch(self.port, "/quote?time=1&capacity=4500")
+                                           for _ in range(20)])
+        self.assertEqual(len({json.dumps(body) for _, body in responses}), 1)
+        self.assertEqual(self.service.solves, 1)
+
+    async def test_rejects_bad_requests(self):
+        """
+        Bad parameters, paths and methods get 400, 404 and 405.
+        """
+        self.assertEqual((await fetch(self.port, "/quote?time=x&capacity=1"))[0], 400)
+        self.assertEqual((await fetch(self.port, "/quote?time=1&capacity=-1"))[0], 400)
+        self.assertEqual((await fetch(self.port, "/other"))[0], 404)
+        self.assertEqual((await fetch(self.port, "/quote", method="DELETE"))[0], 405)
+        self.assertEqual(await fetch(self.port, "/health"), (200, {"status": "ok"}))
+
+    async def test_rejects_oversize_capacity(self):
+        """
+        A capacity above max_capacity gets a 400 without reaching the workers.
+        """
+        status, body = await fetch(self.port, f"/quote?time=1&capacity={10 ** 10}")
+        self.assertEqual(status, 400)
+        self.assertIn(str(self.service.max_capacity), body["error"])
+        self.assertEqual(self.service.solves, 0)
+
+    async def test_bad_content_length(self):
+        """
+        A non-numeric Content-Length gets a 400 instead of dropping the connection.
+        """
+        status, _ = await fetch(self.port, "/health", headers="Content-Length: abc\r\n")
+        self.assertEqual(status, 400)
+
+    async def test_failed_solve(self):
+        """
+        A solve that raises gets a 500 with a JSON body.
+        """
+        broken = QuoteService(prices="missing.json", workers=1)
+        try:
+            status, body = await broken.respond("GET", "/quote?time=1&capacity=10")
+        finally:
+            broken.close()
+        self.assertEqual(status, 500)
+        self.assertIn("error", body)
+
+    async def test_asgi(self):
+        """
+        The ASGI entry point serves the same quotes.
+        """
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/quote", "query_string": b"time=1&capacity=160"}
+        await self.service.asgi(scope, None, send)
+        self.assertEqual(messages[0]["status"], 200)
+        self.assertEqual(json.loads(messages[1]["body"]), minimize_cost(1, 160, box_sizes, city_costs))
+
+
+if __name__ == '__main__':
+    unittest.main()
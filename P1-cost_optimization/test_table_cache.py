@@ -0,0 +1,110 @@
+"""
+Unit tests for the TableCache class and its use by minimize_cost.
+
+Test cases include:
+- Warm calls returning the same result as cold calls.
+- A price change producing a new key instead of reading a stale table.
+- LRU eviction once more than max_tables tables are stored.
+- Tables persisted to disk and memory-mapped by a fresh cache.
+- Truncated table files being ignored.
+- Table files beyond max_files being deleted, least recently used first.
+"""
+
+import os
+import tempfile
+import unittest
+from main import minimize_cost
+from table_cache import TableCache
+
+class TestTableCache(unittest.TestCase):
+
+    def setUp(self):
+        # Define available box sizes in the required order.
+        self.box_sizes = [("XXL", 320), ("XL", 160), ("L", 80), ("M", 40), ("S", 20), ("XS", 10)]
+
+        # Define cost of each box per hour in different cities.
+        self.city_costs = {
+            "Delhi": {"XS": 12, "S": 23, "M": 45, "L": 77.4, "XL": 140, "XXL": 282},
+            "Mumbai": {"XS": 14, "S": None, "M": 41.3, "L": 89, "XL": 130, "XXL": 297},
+            "Kolkata": {"XS": 11, "S": 20, "M": None, "L": 67, "XL": 118, "XXL": None},
+        }
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_warm_call_matches_cold_call(self):
+        """
+        A cached table answers the same capacity and every smaller one identically.
+        """
+        cache = TableCache()
+        for capacity in (1150, 1150, 160, 0, 5):
+            expected = minimize_cost(1, capacity, self.box_sizes, self.city_costs)
+            result = minimize_cost(1, capacity, self.box_sizes, self.city_costs, cache=cache)
+            self.assertEqual(result, expected)
+        self.assertEqual(len(cache), 3)
+
+    def test_price_change_invalidates(self):
+        """
+        Changing one price gives that city a new table; the old one is never read.
+        """
+        cache = TableCache()
+        minimize_cost(1, 1150, self.box_sizes, self.city_costs, cache=cache)
+        self.city_costs["Delhi"]["XL"] = 100
+        expected = minimize_cost(1, 1150, self.box_sizes, self.city_costs)
+        result = minimize_cost(1, 1150, self.box_sizes, self.city_costs, cache=cache)
+        self.assertEqual(result, expected)
+        self.assertEqual(len(cache), 4)
+
+    def test_lru_eviction(self):
+        """
+        Only the max_tables most recently used tables stay in memory.
+        """
+        cache = TableCache(max_tables=2)
+        minimize_cost(1, 1150, self.box_sizes, self.city_costs, cache=cache)
+        self.assertEqual(len(cache), 2)
+        with self.assertRaises(ValueError):
+            TableCache(max_tables=0)
+
+    def test_disk_round_trip(self):
+        """
+        A fresh cache pointed at the same directory loads the memory-mapped tables.
+        """
+        expected = minimize_cost(1, 1150, self.box_sizes, self.city_costs,
+                                 cache=TableCache(directory=self.directory.name))
+        restarted = TableCache(directory=self.directory.name)
+        key = TableCache.key([32, 16, 8, 4, 2, 1], [28200, 14000, 7740, 4500, 2300, 1200])
+        self.assertIsNotNone(restarted.get(key, 115))
+        self.assertIsNone(restarted.get(key, 116))
+        result = minimize_cost(1, 1150, self.box_sizes, self.city_costs, cache=restarted)
+        self.assertEqual(result, expected)
+        restarted.clear()
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+    def test_truncated_file_ignored(self):
+        """
+        A table file with the wrong length is treated as missing.
+        """
+        cache = TableCache(directory=self.directory.name)
+        cache.put("broken", [0, 1500], [-1, 0])
+        with open(os.path.join(self.directory.name, "broken.table"), "r+b") as f:
+            f.truncate(12)
+        self.assertIsNone(TableCache(directory=self.directory.name).get("broken", 0))
+
+    def test_disk_limit(self):
+        """
+        Only the max_files most recently used table files stay on disk.
+        """
+        cache = TableCache(directory=self.directory.name, max_files=2)
+        for name in ("a", "b"):
+            cache.put(name, [0, 1500], [-1, 0])
+        os.utime(os.path.join(self.directory.name, "a.table"), ns=(0, 0))
+        os.utime(os.path.join(self.directory.name, "b.table"), ns=(1, 1))
+        # Loading "a" marks it as recently used, so "b" is the one deleted.
+        self.assertIsNotNone(TableCache(directory=self.directory.name).get("a", 1))
+        cache.put("c", [0, 1500], [-1, 0])
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["a.table", "c.table"])
+        with self.assertRaises(ValueError):
+            TableCache(max_files=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -44,7 +44,8 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        # Token authentication that caches tokens and their users (see myapp/authentication.py)
+        'myapp.authentication.CachedTokenAuthentication',
         # Optional, include session authentication
         'rest_framework.authentication.SessionAuthentication',
     ),
@@ -53,6 +54,11 @@ REST_FRAMEWORK = {
     )
 }
 
+# Default number of items per page of the paginated list APIs, and the largest
+# page a client can request with ?page_size=
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 200
+
 
 
 MIDDLEWARE = [
@@ -97,6 +103,27 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Local memory is per process. When running several server processes, switch to a shared
+# backend (e.g. 'django.core.cache.backends.redis.RedisCache') so they share cache
+# entries and invalidations.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Cache alias and lifetime (seconds) of authenticated API tokens
+TOKEN_AUTH_CACHE = 'default'
+TOKEN_AUTH_CACHE_TTL = 300
+
+# Companies per page on the home page, and how long (seconds) a rendered page stays cached
+HOME_PAGE_SIZE = 25
+HOME_CACHE_TTL = 3600
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
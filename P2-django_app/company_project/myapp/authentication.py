@@ -0,0 +1,88 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from django.utils.translation import gettext_lazy as _
+
+# User fields kept in the token cache: what authentication and the permission checks read.
+# Secrets such as the password hash are left out; any other field is loaded on first access.
+SNAPSHOT_FIELDS = ('id', 'email', 'first_name', 'last_name', 'is_active', 'is_staff', 'is_superuser')
+
+
+def token_cache_key(key):
+    """
+    Cache key for a token. The key is hashed so raw tokens never end up in the cache.
+    """
+    return 'auth-token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_token_cache():
+    """
+    The cache holding authenticated tokens: the TOKEN_AUTH_CACHE alias from settings.CACHES.
+    """
+    return caches[getattr(settings, 'TOKEN_AUTH_CACHE', 'default')]
+
+
+def invalidate_token(key):
+    """
+    Drop a token from the cache so the next request with it is checked against the database.
+    """
+    get_token_cache().delete(token_cache_key(key))
+
+
+def snapshot_user(user):
+    """
+    The SNAPSHOT_FIELDS of a user, in model field order, as a dict safe to cache.
+    """
+    return {field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields if field.attname in SNAPSHOT_FIELDS}
+
+
+def restore_user(snapshot):
+    """
+    Rebuild a user from its snapshot as if loaded with .only(*SNAPSHOT_FIELDS): other
+    fields are deferred, and saving it only writes the snapshot fields.
+    """
+    User = get_user_model()
+    return User.from_db(DEFAULT_DB_ALIAS, list(snapshot), list(snapshot.values()))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches a snapshot of each token's user.
+
+    The stock TokenAuthentication joins authtoken_token and myapp_user on every request.
+    Here the first request with a token does that query and caches a snapshot of the user
+    (SNAPSHOT_FIELDS only, never the password hash) for TOKEN_AUTH_CACHE_TTL seconds;
+    later requests rebuild the user from the snapshot without a query.
+
+    The cache is the TOKEN_AUTH_CACHE alias in settings.CACHES: local memory by default,
+    or a shared backend (Redis, Memcached) so that all server processes share entries and
+    invalidations. Entries are dropped by the signal handlers in myapp/signals.py when a
+    token is deleted or rotated and when its user is saved (edited or deactivated) or
+    deleted. Changes that bypass signals (e.g. QuerySet.update()) are only picked up once
+    the TTL expires.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_token_cache()
+        cache_key = token_cache_key(key)
+        cached = cache.get(cache_key)
+        if cached is None:
+            # Raises AuthenticationFailed for unknown tokens and inactive users, which are not cached.
+            user, token = super().authenticate_credentials(key)
+            cache.set(cache_key, {'user': snapshot_user(user), 'created': token.created},
+                      getattr(settings, 'TOKEN_AUTH_CACHE_TTL', 300))
+            return (user, token)
+
+        user = restore_user(cached['user'])
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        token = self.get_model().from_db(DEFAULT_DB_ALIAS, ['key', 'user_id', 'created'],
+                                         [key, user.pk, cached['created']])
+        token.user = user
+        return (user, token)
@@ -0,0 +1,19 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class PrimaryKeyCursorPagination(CursorPagination):
+    """
+    Cursor pagination over the primary key for the list APIs.
+
+    Each page is fetched with `WHERE id > <cursor> ORDER BY id LIMIT <page_size + 1>`, so
+    a page costs the same however deep it is (no OFFSET scan), no COUNT(*) is run, and
+    rows inserted while a client is paging never shift or repeat the pages it reads.
+    Clients follow the opaque `next` / `previous` links in the response.
+    """
+    # The primary key is unique and indexed, which keeps the cursor position unambiguous.
+    ordering = 'pk'
+    # Clients may ask for a different page size with ?page_size=, up to max_page_size.
+    page_size = getattr(settings, 'API_PAGE_SIZE', 50)
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 200)
@@ -0,0 +1,36 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token
+from .models import Company
+from .views import invalidate_home_page
+
+
+# A token that is deleted (including when it is rotated) or replaced must stop authenticating.
+# Invalidation waits for the commit: dropped any earlier, a concurrent request could cache
+# the old row again before the change is visible to it.
+@receiver(post_delete, sender=Token)
+@receiver(post_save, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    transaction.on_commit(partial(invalidate_token, instance.key))
+
+
+# Editing or deactivating a user must not leave a stale snapshot of them in the token cache.
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    if created:
+        return
+    for key in Token.objects.filter(user_id=instance.pk).values_list('key', flat=True):
+        transaction.on_commit(partial(invalidate_token, key))
+
+
+# Any change to the companies must show up on the cached home page, once it commits.
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Company)
+def invalidate_home_companies(sender, instance, **kwargs):
+    transaction.on_commit(invalidate_home_page)
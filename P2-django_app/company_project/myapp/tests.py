@@ -1,15 +1,23 @@
 # myapp/tests.py
+from unittest import mock
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework.authtoken.models import Token
 from .models import Company
+from .authentication import CachedTokenAuthentication, token_cache_key
+from .pagination import PrimaryKeyCursorPagination
 
 User = get_user_model()
 
 class OverallAppTestCase(APITestCase):
     def setUp(self):
+        # Start every test with an empty token cache
+        cache.clear()
         # Create two test users
         self.user1 = User.objects.create_user(
             email="user1@example.com", password="pass1234",
@@ -68,7 +76,45 @@ class OverallAppTestCase(APITestCase):
         url = reverse('api_company_list')
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertGreaterEqual(len(response.data['results']), 1)
+
+    def test_company_list_cursor_pagination(self):
+        """
+        Test that the company list is paged by primary key and that rows inserted
+        while paging neither repeat nor shift the pages already being read.
+        """
+        for i in range(4):
+            Company.objects.create(name=f"Company {i}")
+        self.authenticate(self.user1)
+        url = reverse('api_company_list')
+        response = self.client.get(url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        seen = [company['id'] for company in response.data['results']]
+        self.assertEqual(len(seen), 2)
+
+        # A company inserted mid-way shows up at the end, not in an earlier page.
+        late = Company.objects.create(name="Late Company")
+        next_url = response.data['next']
+        while next_url:
+            response = self.client.get(next_url)
+            seen += [company['id'] for company in response.data['results']]
+            next_url = response.data['next']
+        expected = list(Company.objects.order_by('pk').values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+        self.assertEqual(seen[-1], late.pk)
+
+    def test_user_list_page_size_cap(self):
+        """
+        Test that the user list is paginated and that page_size is capped.
+        """
+        self.authenticate(self.user1)
+        url = reverse('api_user_list')
+        with mock.patch.object(PrimaryKeyCursorPagination, 'max_page_size', 1):
+            response = self.client.get(url, {'page_size': 1000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNotNone(response.data['next'])
 
     def test_company_create_api_admin_only(self):
         """
@@ -134,3 +180,124 @@ class OverallAppTestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.user2.refresh_from_db()
         self.assertEqual(self.user2.first_name, "AdminUpdated")
+
+    def test_cached_token_authentication(self):
+        """
+        Test that a token is looked up in the database only on its first request.
+        """
+        self.authenticate(self.user1)
+        url = reverse('api_company_detail', args=[self.company.id])
+        # Token and user lookup, then the company itself.
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    def test_cached_token_holds_no_secrets(self):
+        """
+        Test that the token cache holds a user snapshot without the password hash, and
+        that the rebuilt user still loads and saves other fields correctly.
+        """
+        self.authenticate(self.user1)
+        url = reverse('api_company_detail', args=[self.company.id])
+        self.client.get(url)
+        token = Token.objects.get(user=self.user1)
+        cached = cache.get(token_cache_key(token.key))
+        self.assertNotIn('password', cached['user'])
+        self.assertNotIn(self.user1.password, repr(cached))
+
+        user, auth = CachedTokenAuthentication().authenticate_credentials(token.key)
+        self.assertEqual((user.pk, user.email, auth.key), (self.user1.pk, self.user1.email, token.key))
+        user.first_name = "Renamed"
+        user.save()
+        self.user1.refresh_from_db()
+        self.assertEqual(self.user1.first_name, "Renamed")
+        self.assertTrue(self.user1.check_password("pass1234"))
+
+    def test_cached_token_invalidated_on_user_change(self):
+        """
+        Test that editing or deactivating a user drops their cached token.
+        """
+        self.authenticate(self.user1)
+        url = reverse('api_company_detail', args=[self.company.id])
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user1.is_staff = True
+            self.user1.save()
+        response = self.client.patch(url, {"address": "1 Admin Road"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user1.is_active = False
+            self.user1.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_token_invalidated_on_rotation(self):
+        """
+        Test that a rotated (deleted and re-created) token stops authenticating as soon as
+        the deletion commits.
+        """
+        self.authenticate(self.user1)
+        url = reverse('api_company_detail', args=[self.company.id])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        # The cached token is only dropped once the deletion commits.
+        key = Token.objects.get(user=self.user1).key
+        with self.captureOnCommitCallbacks() as callbacks:
+            Token.objects.filter(user=self.user1).delete()
+        self.assertIsNotNone(cache.get(token_cache_key(key)))
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.authenticate(self.user1)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    def test_home_page_cached(self):
+        """
+        Test that the home page company list is served from the cache once rendered,
+        loads only id and name, and is refreshed when a company changes.
+        """
+        self.client.force_login(self.user1)
+        url = reverse('home')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertContains(response, '<li class="company-item">Test Company</li>', html=True)
+        company_queries = [q['sql'] for q in queries if 'myapp_company' in q['sql']]
+        self.assertTrue(company_queries)
+        self.assertFalse(any('description' in sql for sql in company_queries))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        self.assertFalse(any('myapp_company' in q['sql'] for q in queries))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Company.objects.create(name="Fresh Company")
+        self.assertContains(self.client.get(url), "Fresh Company")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.company.delete()
+        self.assertNotContains(self.client.get(url), "Test Company")
+
+    def test_home_page_paginated(self):
+        """
+        Test that the home page lists companies a page at a time.
+        """
+        for i in range(30):
+            Company.objects.create(name=f"Company {i:02d}")
+        self.client.force_login(self.user1)
+        url = reverse('home')
+        with self.settings(HOME_PAGE_SIZE=25):
+            first = self.client.get(url)
+            second = self.client.get(url, {'page': 2})
+        self.assertContains(first, "Company 23")
+        self.assertNotContains(first, "Company 24")
+        self.assertContains(second, "Company 29")
+        self.assertContains(second, "Page 2 of 2")
+
+        # Out-of-range and invalid page numbers are served from the cached first and
+        # last pages instead of rendering (and caching) a fragment of their own.
+        with self.settings(HOME_PAGE_SIZE=25), CaptureQueriesContext(connection) as queries:
+            for page in (3, 99, 10 ** 9, -5, 'x'):
+                response = self.client.get(url, {'page': page})
+        self.assertFalse(any('myapp_company' in q['sql'] for q in queries))
+        self.assertContains(response, "Page 1 of 2")
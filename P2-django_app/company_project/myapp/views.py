@@ -1,4 +1,8 @@
 from django.shortcuts import render, redirect, get_object_or_404
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
 from django.http import HttpResponse
 from django.contrib.auth.decorators import login_required
 from .models import Company, User
@@ -65,13 +69,54 @@ def user_edit(request, pk):
     return render(request, 'user_edit.html', {'form': form})
 
 
+# Cache key of the number that versions the cached home page fragments
+HOME_VERSION_KEY = 'home-companies-version'
+
+
+def invalidate_home_page():
+    """
+    Discard every cached page of the home page company list.
+    Bumping the version makes all existing fragment keys unreachable at once.
+    """
+    try:
+        cache.incr(HOME_VERSION_KEY)
+    except ValueError:
+        # No version cached yet (or it was evicted): nothing stale can be reached.
+        cache.set(HOME_VERSION_KEY, 1, None)
+
+
 def home(request):
     if not request.user.is_authenticated:
         # User is not logged in; send them to the login page.
         return redirect('login')
-    
-    companies = Company.objects.all()
-    return render(request, 'home.html', {'companies': companies})
+
+    try:
+        page_number = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page_number = 1
+
+    # The company list is the same for every user, so its rendered HTML is cached per page
+    # and rebuilt only after a company changes (see myapp/signals.py).
+    version = cache.get_or_set(HOME_VERSION_KEY, 1, None)
+    # Only the columns the list shows; address and description are never loaded.
+    paginator = Paginator(Company.objects.only('id', 'name').order_by('pk'), settings.HOME_PAGE_SIZE)
+
+    # The page count is cached with the same version, so out-of-range page numbers can be
+    # clamped to the last page before they make a cache key without counting the rows.
+    pages_key = f'home-companies:{version}:pages'
+    num_pages = cache.get(pages_key)
+    if num_pages is None:
+        num_pages = paginator.num_pages
+        cache.set(pages_key, num_pages, settings.HOME_CACHE_TTL)
+    page_number = min(page_number, num_pages)
+
+    fragment_key = f'home-companies:{version}:{page_number}'
+    company_list = cache.get(fragment_key)
+    if company_list is None:
+        page = paginator.get_page(page_number)
+        company_list = render_to_string('company_list.html', {'page': page})
+        cache.set(fragment_key, company_list, settings.HOME_CACHE_TTL)
+    return render(request, 'home.html', {'company_list': company_list})
 
 
 
@@ -8,6 +8,7 @@ from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from .serializers import CustomAuthTokenSerializer
+from .pagination import PrimaryKeyCursorPagination
 
 class CustomObtainAuthToken(ObtainAuthToken):
     # Set the serializer class to our custom serializer that accepts email and password.
@@ -32,6 +33,8 @@ class CompanyListCreateAPI(generics.ListCreateAPIView):
     serializer_class = CompanySerializer
     # Allow all authenticated users to view, but only admins can create
     permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
+    # Page through companies by primary key instead of returning the whole table
+    pagination_class = PrimaryKeyCursorPagination
 
 # Retrieve, update, or destroy view for a specific company:
 class CompanyRetrieveUpdateDestroyAPI(generics.RetrieveUpdateDestroyAPIView):
@@ -46,6 +49,8 @@ class UserListCreateAPI(generics.ListCreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]  # All authenticated users can list users
+    # Page through users by primary key instead of returning the whole table
+    pagination_class = PrimaryKeyCursorPagination
 
     def get_permissions(self):
         # For POST requests, require admin permission.